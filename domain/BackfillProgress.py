@@ -0,0 +1,29 @@
+from attr import dataclass
+
+IDLE = "idle"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class BackfillProgress:
+    # idle, running, done, failed or cancelled
+    state: str = IDLE
+    # crawling the whole channel history instead of only new messages
+    full_rebuild: bool = False
+    # Wordle result messages found in the channel history
+    scanned: int = 0
+    # messages whose results were parsed
+    parsed: int = 0
+    # messages newly recorded in the ledger
+    recorded: int = 0
+    # messages not recorded because a player couldn't be resolved, the next crawl retries them
+    unresolved: int = 0
+    # users whose totals were recomputed
+    users_updated: int = 0
+    error: str | None = None
+    # unix timestamps
+    started_at: float | None = None
+    finished_at: float | None = None
@@ -11,7 +11,10 @@ class GameScore:
         self.excluded_users = []
 
         for user in users:
-            user_score = user.games[name]
+            user_score = user.games.get(name)
+            if user_score is None:
+                # no opinion on the game, neither a fan nor excluded
+                continue
             if user_score > 0:
                 heapq.heappush(self.favored_users, (-user_score, user))
             else:
@@ -0,0 +1,17 @@
+from attr import dataclass
+
+
+@dataclass
+class JobStats:
+    # seconds between runs, before jitter and backoff
+    interval_seconds: float
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+    # failures since the last successful run, each one doubles the next delay
+    consecutive_failures: int = 0
+    last_duration_seconds: float | None = None
+    last_error: str | None = None
+    # unix timestamps
+    last_started_at: float | None = None
+    next_run_at: float | None = None
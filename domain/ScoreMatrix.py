@@ -0,0 +1,46 @@
+import heapq
+from array import array
+
+from domain.User import User
+
+
+class ScoreMatrix:
+    """
+    Users x games score matrix. Every user's scores are stored as one array
+    aligned with `games`, with 0 for games the user has no score for, so the
+    total of any group of users is a column sum over their rows.
+    """
+
+    def __init__(self, users: list[User]):
+        # Union of every user's games, keeping first-seen order for stable ties
+        self.games: list[str] = list(dict.fromkeys(
+            game for user in users for game in user.games))
+        columns = {game: i for i, game in enumerate(self.games)}
+        self.rows: dict[str, array] = {}
+
+        for user in users:
+            row = array('q', bytes(8 * len(self.games)))
+            for game, score in user.games.items():
+                row[columns[game]] = score
+            self.rows[user.id] = row
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self.rows
+
+    def top_games(self, user_ids: list[str], n: int) -> list[tuple[str, int]]:
+        """
+        Get the n games with the highest total score for a group of users.
+
+        Args:
+            user_ids: Users to sum scores for. All must be in the matrix.
+            n: Number of games to return.
+
+        Returns:
+            (game, total score) pairs from highest to lowest total.
+        """
+        rows = [self.rows[user_id] for user_id in user_ids]
+        if not rows:
+            return []
+        totals = list(map(sum, zip(*rows)))
+        top = heapq.nlargest(n, range(len(totals)), key=totals.__getitem__)
+        return [(self.games[i], totals[i]) for i in top]
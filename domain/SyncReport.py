@@ -0,0 +1,15 @@
+from attr import Factory, dataclass
+
+
+@dataclass
+class SyncReport:
+    # sheet rows sent to the database
+    written: int = 0
+    # sheet rows unchanged since the last sync
+    skipped: int = 0
+    # users whose documents were matched by the bulk write
+    matched: int = 0
+    # users whose documents actually changed
+    modified: int = 0
+    # sheet aliases that don't belong to any user
+    unknown_aliases: list[str] = Factory(list)
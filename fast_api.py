@@ -1,16 +1,14 @@
+import asyncio
+import importlib
+import sys
 from contextlib import asynccontextmanager
 
 import uvicorn
+from attr import asdict
 from fastapi import FastAPI, HTTPException
 import logging.config
 
-from config import logging_config
-from persistence.mongo.user_mongo_client import find_user_by_alias
-from persistence.sheet_mapper import map_to_scores
-from service.game_service import update_scores
-from service.google import fetch_google_sheet_data, SHEET_ID, DATA_RANGE, USER_RANGE, END_ROW_TITLE
-from service.hikari.hikari_bot import start_bot, bot
-from service.user_service import update_aliases
+from config import config, logging_config
 
 
 # Custom logging configuration
@@ -31,13 +29,40 @@ def start_api():
     server.serve()
 
 
+# The bot, Google and Mongo clients are slow to import, so this module only
+# imports them where they're used. See utils/import_profile.py.
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Starting bot")
-    await start_bot()
+    # Started in the background so the app answers /_ah/warmup right away
+    startup_task = asyncio.create_task(_start())
+    startup_task.add_done_callback(_log_startup_failure)
     yield
-    logger.info("Shutting down bot")
-    await bot.close()
+    if not startup_task.done():
+        startup_task.cancel()
+    startup = await asyncio.to_thread(importlib.import_module, "service.startup")
+    await startup.stop()
+
+
+async def _start():
+    # Imported in a worker thread, the event loop keeps answering meanwhile
+    startup = await asyncio.to_thread(importlib.import_module, "service.startup")
+    # A failed startup leaves the app without a bot, and with a single instance
+    # nothing else brings it back, so keep trying
+    startup_config = config.get('startup', {})
+    delay = startup_config.get('retry_seconds', 5)
+    while True:
+        try:
+            await startup.start()
+            return
+        except Exception as e:
+            logger.error(f"Startup failed, retrying in {delay}s: {e}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, startup_config.get('max_retry_seconds', 300))
+
+
+def _log_startup_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Startup failed: {task.exception()}")
 
 api = FastAPI(lifespan=lifespan)
 
@@ -52,31 +77,44 @@ async def hello():
     return "App is running"
 
 
+@api.get("/startup")
+async def get_startup_timings():
+    startup = sys.modules.get("service.startup")
+    return startup.startup_timings if startup else {}
+
+
+@api.get("/scheduler")
+async def get_scheduled_jobs():
+    scheduler = sys.modules.get("service.scheduler")
+    return scheduler.scheduler.stats() if scheduler else {}
+
+
+@api.get("/wordle/backfill")
+async def get_wordle_backfill():
+    wordle_backfill = sys.modules.get("service.wordle_backfill")
+    if wordle_backfill is None:
+        from domain.BackfillProgress import BackfillProgress
+        return asdict(BackfillProgress())
+    return asdict(wordle_backfill.wordle_backfill.progress)
+
+
 @api.get("/user/{alias}")
 async def get_user(alias: str):
+    from service.alias_index import alias_index
+
     logger.info(f"Getting user by alias {alias}")
-    return find_user_by_alias(alias.upper())
+    return await alias_index.find_user_by_alias(alias.upper())
 
 
 @api.post("/sheet/update")
-async def update_sheet():
+async def update_sheet(force: bool = False):
+    from service.sheet_sync import sync_sheet
+
     try:
-        success = 0
-        logger.info("Reading updated user sheet")
-        user_data = fetch_google_sheet_data(SHEET_ID, USER_RANGE)
-        logger.debug(user_data)
-        count = update_aliases(user_data)
-        logger.info(f"Updated {count} user aliases")
-        success += 1
-
-        logger.info("Reading updated data sheet")
-        score_data = fetch_google_sheet_data(SHEET_ID, DATA_RANGE)
-        score_map = map_to_scores(score_data, END_ROW_TITLE)
-        count = update_scores(score_map)
-        logger.info(f"Updated {count} user scores")
-        success += 1
-
-        return {"message": f"{success} successful operations"}
+        alias_report, score_report = await sync_sheet(force)
+        return {"message": "2 successful operations",
+                "aliases": asdict(alias_report),
+                "scores": asdict(score_report)}
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500,
@@ -0,0 +1,73 @@
+# Awaitable variants of user_mongo_client for use on the event loop. pymongo's
+# client is thread safe, so each call runs the synchronous query in a worker
+# thread over the shared connection pool configured in mongo_client.
+import asyncio
+from typing import Dict, Iterable
+
+import hikari
+
+from persistence.mongo import user_mongo_client
+
+
+async def create_user(user) -> str:
+    return await asyncio.to_thread(user_mongo_client.create_user, user)
+
+
+async def get_user(user_id):
+    return await asyncio.to_thread(user_mongo_client.get_user, user_id)
+
+
+async def update_user(user_id, update_data):
+    return await asyncio.to_thread(user_mongo_client.update_user, user_id, update_data)
+
+
+async def add_aliases(user_id: str, *aliases: str):
+    return await asyncio.to_thread(user_mongo_client.add_aliases, user_id, *aliases)
+
+
+async def bulk_add_aliases(aliases_by_user: Dict[str, Iterable[str]]):
+    return await asyncio.to_thread(user_mongo_client.bulk_add_aliases, aliases_by_user)
+
+
+async def find_user_by_alias(alias: str):
+    return await asyncio.to_thread(user_mongo_client.find_user_by_alias, alias)
+
+
+async def find_users_by_aliases(aliases: Iterable[str]) -> list[dict]:
+    return await asyncio.to_thread(user_mongo_client.find_users_by_aliases, aliases)
+
+
+async def find_users_by_yo_count(limit: int = 5):
+    return await asyncio.to_thread(user_mongo_client.find_users_by_yo_count, limit)
+
+
+async def remove_alias(user_id, alias):
+    return await asyncio.to_thread(user_mongo_client.remove_alias, user_id, alias)
+
+
+async def add_games(user_id: str, games: Dict[str, int]):
+    return await asyncio.to_thread(user_mongo_client.add_games, user_id, games)
+
+
+async def bulk_add_games(games_by_user: Dict[str, Dict[str, int]]):
+    return await asyncio.to_thread(user_mongo_client.bulk_add_games, games_by_user)
+
+
+async def add_game(user_id, game_name, score):
+    return await asyncio.to_thread(user_mongo_client.add_game, user_id, game_name, score)
+
+
+async def delete_user(user_id):
+    return await asyncio.to_thread(user_mongo_client.delete_user, user_id)
+
+
+async def update_yo_count(author: hikari.users.User):
+    return await asyncio.to_thread(user_mongo_client.update_yo_count, author)
+
+
+async def get_yo_counter():
+    return await asyncio.to_thread(user_mongo_client.get_yo_counter)
+
+
+async def bulk_add_yo_counts(counts_by_user: Dict[str, tuple[str, int]]):
+    return await asyncio.to_thread(user_mongo_client.bulk_add_yo_counts, counts_by_user)
@@ -0,0 +1,35 @@
+# Awaitable variants of wordle_mongo_client for use on the event loop, see
+# async_user_mongo_client.
+import asyncio
+from typing import Dict, Iterable
+
+from domain.Wordle import WordleUser
+from persistence.mongo import wordle_mongo_client
+
+
+async def record_results(message_id: int, documents: Iterable[WordleUser]) -> bool:
+    return await asyncio.to_thread(wordle_mongo_client.record_results, message_id, documents)
+
+
+async def bulk_record_results(results: Dict[int, Iterable[WordleUser]]) -> int:
+    return await asyncio.to_thread(wordle_mongo_client.bulk_record_results, results)
+
+
+async def rebuild_totals(names: Iterable[str] | None = None) -> int:
+    return await asyncio.to_thread(wordle_mongo_client.rebuild_totals, names)
+
+
+async def get_completed_through() -> int | None:
+    return await asyncio.to_thread(wordle_mongo_client.get_completed_through)
+
+
+async def set_completed_through(message_id: int):
+    return await asyncio.to_thread(wordle_mongo_client.set_completed_through, message_id)
+
+
+async def get_top_avg_scores(count: int, min_play_count: int = 1) -> list[tuple[str, float]]:
+    return await asyncio.to_thread(wordle_mongo_client.get_top_avg_scores, count, min_play_count)
+
+
+async def get_top_winners(count: int) -> list[tuple[str, int]]:
+    return await asyncio.to_thread(wordle_mongo_client.get_top_winners, count)
@@ -0,0 +1,46 @@
+import logging
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from persistence.mongo.mongo_client import get_collection
+
+logger = logging.getLogger(__name__)
+
+# Collection name -> the indexes its hot queries rely on
+INDEXES: dict[str, list[IndexModel]] = {
+    'users': [
+        # find_user_by_alias and find_users_by_aliases, multikey over the aliases array
+        IndexModel([('aliases', ASCENDING)], name='aliases'),
+        # find_users_by_yo_count
+        IndexModel([('yo_count', DESCENDING)], name='yo_count'),
+    ],
+    'wordle': [
+        # get_top_avg_scores sorts by average and filters on play count
+        IndexModel([('average_score', ASCENDING), ('play_count', ASCENDING)], name='average_score_play_count'),
+        # get_top_winners
+        IndexModel([('win_count', DESCENDING)], name='win_count'),
+    ],
+    'wordle_ledger': [
+        # rebuild_totals for a set of users
+        IndexModel([('results.name', ASCENDING)], name='results_name'),
+    ],
+    'sheet_fingerprints': [
+        # get_fingerprints
+        IndexModel([('range', ASCENDING)], name='range'),
+    ],
+}
+
+
+def ensure_indexes() -> dict[str, list[str]]:
+    """
+    Create the indexes in INDEXES. Indexes that already exist are left alone,
+    so this is safe to run on every startup.
+
+    Returns:
+        Collection name -> names of its ensured indexes
+    """
+    ensured = {}
+    for collection_name, indexes in INDEXES.items():
+        ensured[collection_name] = get_collection(collection_name).create_indexes(indexes)
+        logger.info(f"Ensured indexes {ensured[collection_name]} on {collection_name}")
+    return ensured
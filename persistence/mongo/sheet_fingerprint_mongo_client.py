@@ -0,0 +1,49 @@
+from typing import Dict, Iterable
+
+from pymongo import ReplaceOne
+
+from persistence.mongo.mongo_client import get_collection
+
+fingerprint_collection = get_collection('sheet_fingerprints')
+
+# Key under which the fingerprint of a whole sheet range is stored
+RANGE_KEY = ""
+
+
+def get_fingerprints(sheet_range: str) -> Dict[str, str]:
+    """
+    Get the stored fingerprints of a sheet range.
+
+    Args:
+        sheet_range (str): The sheet range the fingerprints belong to.
+
+    Returns:
+        Dict[str, str]: Row key -> fingerprint. The whole range is stored under RANGE_KEY.
+    """
+    return {doc["key"]: doc["hash"]
+            for doc in fingerprint_collection.find({"range": sheet_range})}
+
+
+def save_fingerprints(sheet_range: str,
+                      fingerprints: Dict[str, str],
+                      stale_keys: Iterable[str] = ()) -> None:
+    """
+    Upsert fingerprints of a sheet range and delete the ones of rows that no longer exist.
+
+    Args:
+        sheet_range (str): The sheet range the fingerprints belong to.
+        fingerprints (Dict[str, str]): Row key -> fingerprint to store.
+        stale_keys (Iterable[str]): Row keys to forget.
+    """
+    operations = [
+        ReplaceOne(
+            {"_id": f"{sheet_range}:{key}"},
+            {"range": sheet_range, "key": key, "hash": value},
+            upsert=True)
+        for key, value in fingerprints.items()]
+    if operations:
+        fingerprint_collection.bulk_write(operations, ordered=False)
+
+    stale_ids = [f"{sheet_range}:{key}" for key in stale_keys]
+    if stale_ids:
+        fingerprint_collection.delete_many({"_id": {"$in": stale_ids}})
@@ -1,7 +1,8 @@
-from typing import Dict
+from typing import Dict, Iterable
 
 import hikari
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.results import BulkWriteResult
 
 from domain.User import User
 from persistence.EntityNotFoundError import EntityNotFoundError
@@ -83,6 +84,28 @@ def add_aliases(user_id: str, *aliases: str):
     )
 
 
+def bulk_add_aliases(aliases_by_user: Dict[str, Iterable[str]]) -> BulkWriteResult | None:
+    """
+    Add aliases to many users with one unordered bulk write. Unlike add_aliases,
+    no documents are returned.
+
+    Args:
+        aliases_by_user (Dict[str, Iterable[str]]): User ID -> aliases to add.
+
+    Returns:
+        BulkWriteResult: The result of the bulk write, or None if there was nothing to write.
+    """
+    operations = [
+        UpdateOne(
+            {"_id": user_id},
+            {"$addToSet": {"aliases": {"$each": [alias.upper() for alias in aliases]}}},
+            upsert=True)
+        for user_id, aliases in aliases_by_user.items()]
+    if not operations:
+        return None
+    return users_collection.bulk_write(operations, ordered=False)
+
+
 def find_user_by_alias(alias: str):
     """
     Find a user by alias.
@@ -99,6 +122,29 @@ def find_user_by_alias(alias: str):
     return result
 
 
+def find_users_by_aliases(aliases: Iterable[str]) -> list[dict]:
+    """
+    Find every user owning at least one of the given aliases in a single query.
+
+    Args:
+        aliases (Iterable[str]): The aliases to search for.
+
+    Returns:
+        list[dict]: The matching user documents. Unknown aliases are simply absent.
+    """
+    return list(users_collection.find({"aliases": {"$in": list(aliases)}}))
+
+
+def find_users_with_aliases() -> list[dict]:
+    """
+    Find every user that has aliases, i.e. every user known to the sheet.
+
+    Returns:
+        list[dict]: The user documents.
+    """
+    return list(users_collection.find({"aliases": {"$exists": True}}))
+
+
 def find_users_by_yo_count(limit: int = 5):
     cursor = (users_collection.find({"yo_count": {"$gt": 0}}, {"_id": -1, "display_name": 1, "yo_count": 1})
               .sort([("yo_count", -1)])
@@ -144,6 +190,23 @@ def add_games(user_id: str, games: Dict[str, int]):
     )
 
 
+def bulk_add_games(games_by_user: Dict[str, Dict[str, int]]) -> BulkWriteResult | None:
+    """
+    Replace the games dictionary of many users with one unordered bulk write.
+
+    Args:
+        games_by_user (Dict[str, Dict[str, int]]): User ID -> games to store.
+
+    Returns:
+        BulkWriteResult: The result of the bulk write, or None if there was nothing to write.
+    """
+    operations = [UpdateOne({"_id": user_id}, {"$set": {"games": games}})
+                  for user_id, games in games_by_user.items()]
+    if not operations:
+        return None
+    return users_collection.bulk_write(operations, ordered=False)
+
+
 def add_game(user_id, game_name, score):
     """
     Add a game to a user's games dictionary and return the updated document.
@@ -203,5 +266,40 @@ def update_yo_count(author: hikari.users.User):
     return user["yo_count"], counter
 
 
+def get_yo_counter():
+    """
+    Get the global yo-counter document.
+
+    Returns:
+        dict: The yo-counter document, or None if nobody said yo yet.
+    """
+    return users_collection.find_one({"_id": "yo-counter"})
+
+
+def bulk_add_yo_counts(counts_by_user: Dict[str, tuple[str, int]]):
+    """
+    Add to the yo counts of many users and to the global yo-counter with one
+    unordered bulk write.
+
+    Args:
+        counts_by_user (Dict[str, tuple[str, int]]): User ID -> (display name, yos to add).
+
+    Returns:
+        BulkWriteResult: The result of the bulk write, or None if there was nothing to write.
+    """
+    operations = [
+        UpdateOne(
+            {"_id": user_id},
+            {"$inc": {"yo_count": count}, "$set": {"display_name": display_name}},
+            upsert=True)
+        for user_id, (display_name, count) in counts_by_user.items()]
+    if not operations:
+        return None
+    total = sum(count for _, count in counts_by_user.values())
+    operations.append(UpdateOne({"_id": "yo-counter"}, {"$inc": {"count": total}}, upsert=True))
+    return users_collection.bulk_write(operations, ordered=False)
+
+
 def to_user(result) -> User:
-    return User(result["_id"], result["aliases"], result["games"])
+    # users created by the alias sync have no games until the next score sync
+    return User(result["_id"], result["aliases"], result.get("games", {}))
@@ -0,0 +1,39 @@
+import time
+from typing import Dict
+
+from pymongo import DESCENDING, UpdateOne
+
+from persistence.mongo.mongo_client import get_collection
+
+username_collection = get_collection('usernames')
+
+
+def get_usernames(limit: int, resolved_after: float | None = None) -> Dict[int, tuple[str, float | None]]:
+    """
+    Get resolved Discord display names, most recently resolved first.
+
+    Args:
+        limit: The maximum number of names to return
+        resolved_after: Only names resolved after this unix timestamp. Names stored
+            without a resolve time are left out then.
+
+    Returns:
+        User id -> (display name, unix timestamp it was resolved at or None)
+    """
+    query = {} if resolved_after is None else {'resolved_at': {'$gt': resolved_after}}
+    docs = username_collection.find(query).sort('resolved_at', DESCENDING).limit(limit)
+    return {doc['_id']: (doc['name'], doc.get('resolved_at')) for doc in docs}
+
+
+def save_usernames(names: Dict[int, str]):
+    """
+    Store resolved Discord display names with one bulk write, stamped with the current time.
+
+    Args:
+        names: User id -> display name
+    """
+    resolved_at = time.time()
+    operations = [UpdateOne({'_id': int(user_id)}, {'$set': {'name': name, 'resolved_at': resolved_at}}, upsert=True)
+                  for user_id, name in names.items()]
+    if operations:
+        username_collection.bulk_write(operations, ordered=False)
@@ -1,89 +1,187 @@
+from typing import Dict, Iterable
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
 from domain.Wordle import WordleUser
 from persistence.mongo.mongo_client import get_collection
 
 wordle_collection = get_collection('wordle')
+# Message id -> parsed results of that message, the source of the totals above
+ledger_collection = get_collection('wordle_ledger')
+# How far the channel history has been crawled, see get_completed_through
+sync_collection = get_collection('wordle_sync')
+HISTORY_SYNC_ID = 'history'
+DUPLICATE_KEY_ERROR = 11000
+
+# Leaderboard fields kept up to date on every write, so the rank queries are indexed reads
+LEADERBOARD_FIELDS = {
+    '$set': {
+        'average_score': {'$divide': ['$score_sum', '$play_count']},
+        'win_rate': {'$divide': ['$win_count', '$play_count']}
+    }
+}
+
+
+def backfill_leaderboard_fields():
+    """
+    Fill in the leaderboard fields of totals written before they existed.
+    """
+    wordle_collection.update_many(
+        {'average_score': {'$exists': False}, 'play_count': {'$gt': 0}}, [LEADERBOARD_FIELDS])
+
+
+def record_results(message_id: int, documents: Iterable[WordleUser]) -> bool:
+    """
+    Record the parsed results of one Wordle message in the ledger. Each message
+    is recorded at most once, keyed by its id.
+
+    Args:
+        message_id: The message snowflake
+        documents: One WordleUser per player holding that day's statistics
+
+    Returns:
+        True if the message was recorded, False if it already was
+    """
+    try:
+        ledger_collection.insert_one(_to_ledger_entry(message_id, documents))
+        return True
+    except DuplicateKeyError:
+        return False
 
 
-def insert(document: WordleUser):
+def bulk_record_results(results: Dict[int, Iterable[WordleUser]]) -> int:
     """
-    Insert a new WordleUser document into the database.
+    Record the parsed results of many Wordle messages in the ledger with one
+    unordered insert. Messages that are already recorded are skipped.
 
     Args:
-        document: The WordleUser document to insert
+        results: Message snowflake -> one WordleUser per player of that message
+
+    Returns:
+        The number of newly recorded messages
+    """
+    entries = [_to_ledger_entry(message_id, documents) for message_id, documents in results.items()]
+    if not entries:
+        return 0
+    try:
+        return len(ledger_collection.insert_many(entries, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        # Only duplicate keys mean already recorded, anything else must not pass for recorded
+        if any(error['code'] != DUPLICATE_KEY_ERROR for error in e.details['writeErrors']):
+            raise
+        return e.details['nInserted']
+
+
+def rebuild_totals(names: Iterable[str] | None = None) -> int:
+    """
+    Recompute Wordle totals from the ledger and store them.
+
+    Args:
+        names: Only recompute these users. All users are recomputed and users
+            missing from the ledger are removed if not given, unless the ledger is
+            empty. Only pass None after a crawl of the whole history finished.
+
+    Returns:
+        The number of users whose totals were recomputed
     """
-    wordle_collection.update_one({
-        '_id': document.name
-    },
-        {
+    pipeline = [{'$unwind': '$results'}]
+    if names is not None:
+        names = list(names)
+        pipeline = [{'$match': {'results.name': {'$in': names}}},
+                    {'$unwind': '$results'},
+                    {'$match': {'results.name': {'$in': names}}}]
+    pipeline.append({
+        '$group': {
+            '_id': '$results.name',
+            'play_count': {'$sum': 1},
+            'score_sum': {'$sum': '$results.score'},
+            'win_count': {'$sum': {'$cond': ['$results.win', 1, 0]}}
+        }
+    })
+
+    totals = list(ledger_collection.aggregate(pipeline))
+    operations = [
+        UpdateOne({
+            '_id': total['_id']
+        }, {
             '$set': {
-                '_id': document.name,
-                'win_count': document.win_count,
-                'play_count': document.play_count,
-                'score_sum': document.score_sum
+                'play_count': total['play_count'],
+                'score_sum': total['score_sum'],
+                'win_count': total['win_count'],
+                **_leaderboard_fields(total['score_sum'], total['win_count'], total['play_count'])
             }
-    }, upsert=True)
+        }, upsert=True)
+        for total in totals]
+    if operations:
+        wordle_collection.bulk_write(operations, ordered=False)
+    # An empty ledger means nothing was ingested, not that every total is stale
+    if names is None and totals:
+        wordle_collection.delete_many({'_id': {'$nin': [total['_id'] for total in totals]}})
+    return len(totals)
 
 
-def update_wordle_entry(name: str, score: int, win: bool):
+def get_completed_through() -> int | None:
+    """
+    Get the id of the newest message seen by a history crawl that finished.
+    Every Wordle message up to it is in the ledger, while the ledger's newest
+    message says nothing about older ones an interrupted crawl never reached.
+
+    Returns:
+        The message snowflake, or None if no crawl has finished yet
     """
-    Update a user's Wordle statistics in the database.
+    entry = sync_collection.find_one({'_id': HISTORY_SYNC_ID})
+    return entry['completed_through'] if entry else None
 
-    Increments play_count, adds the score to score_sum, and increments win_count if applicable.
-    Creates a new entry if the user doesn't exist.
+
+def set_completed_through(message_id: int):
+    """
+    Record that a history crawl finished through message_id. A full crawl may move
+    the mark back, to before a message it had to skip.
 
     Args:
-        name: The user's name (document _id)
-        score: The score achieved in this game
-        win: Whether the user won this game
-    """
-    wordle_collection.update_one({
-        '_id': name
-    }, {
-        '$inc': {
-            'play_count': 1,
-            'score_sum': score,
-            'win_count': 1 if win else 0
-        }
-    }, upsert=True)
+        message_id: The newest message snowflake every older message was recorded up to
+    """
+    sync_collection.update_one(
+        {'_id': HISTORY_SYNC_ID}, {'$set': {'completed_through': int(message_id)}}, upsert=True)
+
 
+def _leaderboard_fields(score_sum: int, win_count: int, play_count: int) -> dict:
+    if not play_count:
+        return {'average_score': None, 'win_rate': None}
+    return {'average_score': score_sum / play_count, 'win_rate': win_count / play_count}
 
-def get_top_avg_scores(count: int) -> list[tuple[str, float]]:
+
+def _to_ledger_entry(message_id: int, documents: Iterable[WordleUser]) -> dict:
+    return {
+        '_id': int(message_id),
+        'results': [{
+            'name': document.name,
+            'score': document.score_sum,
+            'win': document.win_count > 0
+        } for document in documents]
+    }
+
+
+def get_top_avg_scores(count: int, min_play_count: int = 1) -> list[tuple[str, float]]:
     """
     Get the top users with the lowest average scores.
 
-    Calculates average score as score_sum / play_count for each user and returns
-    the specified count of users with the lowest averages.
+    Reads the precomputed average_score field through its index, only users with
+    at least min_play_count games are ranked.
 
     Args:
         count: The maximum number of results to return
+        min_play_count: The minimum number of games a user must have played
 
     Returns:
         List of tuples (name, average_score) sorted from lowest to highest average score
     """
-    query_projection = {
-        '$project': {
-            '_id': 1,
-            'average_score': {
-                '$divide': ['$score_sum', '$play_count']
-            }
-        }
-    }
-    sort = {
-        '$sort': {
-            'average_score': 1
-        }
-    }
-
-    results = wordle_collection.aggregate(
-        [
-            query_projection,
-            sort,
-            {
-                '$limit': count
-            }
-        ]
-    )
-    return [(doc['_id'], doc['average_score']) for doc in results]
+    docs = wordle_collection.find(
+        {'average_score': {'$ne': None}, 'play_count': {'$gte': min_play_count}},
+        {'average_score': 1}
+    ).sort('average_score', ASCENDING).limit(count)
+    return [(doc['_id'], doc['average_score']) for doc in docs]
 
 
 def get_top_winners(count: int) -> list[tuple[str, int]]:
@@ -98,5 +196,5 @@ def get_top_winners(count: int) -> list[tuple[str, int]]:
     Returns:
         List of tuples (name, win_count) sorted from highest to lowest win count
     """
-    docs = wordle_collection.find().sort('win_count', -1).limit(count)
+    docs = wordle_collection.find({}, {'win_count': 1}).sort('win_count', DESCENDING).limit(count)
     return [(doc['_id'], doc['win_count']) for doc in docs]
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 from typing import List, Dict, Any, Tuple, Optional
 
@@ -15,6 +17,16 @@ def to_score(value: Any) -> int:
         return 0
 
 
+def fingerprint(value: Any) -> str:
+    """
+    Stable content hash of mapped sheet data, used to detect unchanged rows
+    :param value: JSON serializable value, e.g. the scores of one user
+    :return: Hex digest of the value
+    """
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
 def process_header_row(header_row: List[Any]) -> List[str]:
     titles = []
     for game in header_row:
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import threading
+import time
+
+from config import config
+from persistence.mongo import async_user_mongo_client, user_mongo_client
+
+logger = logging.getLogger(__name__)
+
+
+class AliasIndex:
+    """
+    Process-local index of user documents by alias and id. The users collection is
+    small and only changes on sheet syncs, so it is loaded with a single query and
+    served from memory until it is invalidated or older than ttl_seconds.
+    Lookups that miss the index fall back to Mongo.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # Incremented on every load so dependent caches can tell the data changed
+        self.generation = 0
+        self._by_alias: dict[str, dict] = {}
+        self._by_id: dict[str, dict] = {}
+        self._loaded_at: float | None = None
+        # Incremented on every invalidate, so a load that overlaps one isn't trusted
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        Replace the index with the current contents of the users collection. Blocking.
+        If the index is invalidated while loading, the loaded data may predate the write,
+        so it is not marked fresh and the next lookup loads again.
+        """
+        invalidations = self._invalidations
+        by_alias: dict[str, dict] = {}
+        by_id: dict[str, dict] = {}
+        for user in user_mongo_client.find_users_with_aliases():
+            by_id[user["_id"]] = user
+            for alias in user["aliases"]:
+                by_alias[alias] = user
+
+        self._by_alias, self._by_id = by_alias, by_id
+        self._loaded_at = time.monotonic() if invalidations == self._invalidations else None
+        self.generation += 1
+        logger.info(f"Loaded alias index with {len(by_id)} users, stats: {self.stats()}")
+
+    def refresh(self) -> None:
+        """Load the index unless it is fresh. Concurrent callers share one load. Blocking."""
+        with self._lock:
+            if not self.is_fresh():
+                self.load()
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup, e.g. after the users collection was written."""
+        self._invalidations += 1
+        self._loaded_at = None
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def users(self) -> list[dict]:
+        """All currently indexed user documents, without loading."""
+        return list(self._by_id.values())
+
+    async def find_user_by_alias(self, alias: str) -> dict:
+        """
+        Find a user by alias, raising EntityNotFoundError like user_mongo_client.find_user_by_alias.
+        """
+        if not self.is_fresh():
+            await asyncio.to_thread(self.refresh)
+
+        user = self._by_alias.get(alias)
+        if user is not None:
+            self.hits += 1
+            return user
+
+        self.misses += 1
+        user = await async_user_mongo_client.find_user_by_alias(alias)
+        self._add(user)
+        return user
+
+    async def get_user(self, user_id: str) -> dict:
+        """
+        Get a user by id, raising EntityNotFoundError like user_mongo_client.get_user.
+        """
+        if not self.is_fresh():
+            await asyncio.to_thread(self.refresh)
+
+        user = self._by_id.get(user_id)
+        if user is not None:
+            self.hits += 1
+            return user
+
+        self.misses += 1
+        user = await async_user_mongo_client.get_user(user_id)
+        self._add(user)
+        return user
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def _add(self, user: dict) -> None:
+        # Users without aliases aren't on the sheet and have nothing to recommend
+        if "aliases" not in user:
+            return
+        self._by_id[user["_id"]] = user
+        for alias in user["aliases"]:
+            self._by_alias[alias] = user
+
+
+alias_index = AliasIndex(config.get('cache', {}).get('alias_index_ttl_seconds', 300))
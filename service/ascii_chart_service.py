@@ -1,36 +1,60 @@
 import logging
-import sys
-from io import StringIO
-
-import asciibars
 
 
 def format_table(data: list[dict[str, int]]) -> str:
     formatted_table = "\n".join(
         [f"{user['display_name']}: {user['yo_count']}" for user in data])
-    old_stdout = sys.stdout
 
     try:
         tuples = [(str(item['display_name']), int(item['yo_count']))
                   for item in data]
-        sys.stdout = StringIO()
-        spaced_tuples = adjust_spacing(tuples)
-        asciibars.plot(spaced_tuples, sep_lc='|', unit='▓', max_length=40)
-        table_string = sys.stdout.getvalue()
-        return f"```\n{table_string if table_string else formatted_table}\n```"
+        table_string = render_bars(tuples, sep_lc='|', unit='▓', max_length=40)
+        if table_string:
+            return f"```\n{table_string}\n```"
     except Exception as e:
         logging.error(e)
-    finally:
-        sys.stdout = old_stdout
 
     return formatted_table
 
 
-def adjust_spacing(input_tuple: list[tuple[str, int]]) -> list[tuple[str, int]]:
-    max_key, max_value = 0, 0
-
-    for key, value in input_tuple:
-        max_key = max(max_key, len(key))
-        max_value = max(max_value, len(str(value)))
-
-    return [(key.ljust(max_key), value) for key, value in input_tuple]
+def render_bars(data: list[tuple[str, int]],
+                sep_lc: str = ' | ',
+                unit: str = '█',
+                zero: str = '▏',
+                max_length: int = 20) -> str:
+    """
+    Render a horizontal bar chart, laid out like asciibars.plot but returned
+    instead of printed, so it is safe to call from any thread.
+
+    Args:
+        data: (label, count) pairs, in display order
+        sep_lc: Separator between a label and its count
+        unit: String repeated to draw a bar
+        zero: Bar drawn for a count of zero
+        max_length: Length of the longest bar
+
+    Returns:
+        One line per pair, each ending in a newline. Empty for no data.
+    """
+    if not data:
+        return ""
+
+    counts = [count for _, count in data]
+    value_range = max(max(counts), 0) - min(min(counts), 0)
+    lengths = [round(abs(count) / value_range * max_length) if value_range else 0 for count in counts]
+    # negative bars grow to the left of the axis
+    neg_length = max((length for length, count in zip(lengths, counts) if count < 0), default=0)
+    label_width = max(len(label) for label, _ in data)
+    count_width = max(len(str(count)) for count in counts)
+    axis = " " * neg_length
+
+    lines = []
+    for (label, count), length in zip(data, lengths):
+        if count > 0:
+            bar = axis + unit * length
+        elif count < 0:
+            bar = (unit * length).rjust(neg_length)
+        else:
+            bar = axis + zero
+        lines.append(f"{label.ljust(label_width)}{sep_lc}{str(count).rjust(count_width)} {bar}\n")
+    return "".join(lines)
@@ -1,31 +1,154 @@
-import heapq
 import logging
-from typing import Dict
+from typing import Dict, Iterable
 
+from config import config
 from domain.GameScore import GameScore
+from domain.ScoreMatrix import ScoreMatrix
+from domain.SyncReport import SyncReport
 from domain.User import User
-from persistence.mongo import user_mongo_client
+from persistence.mongo import sheet_fingerprint_mongo_client, user_mongo_client
+from persistence.mongo.sheet_fingerprint_mongo_client import RANGE_KEY
+from persistence.mongo.user_mongo_client import to_user
+from persistence.sheet_mapper import fingerprint
+from service.alias_index import alias_index
+from utils.cache import LRUCache
+from utils.string_utils import get_recommendation_string
 
 logger = logging.getLogger(__name__)
 
+# Score matrix of every indexed user, rebuilt whenever the alias index reloads
+_score_matrix: ScoreMatrix | None = None
+_score_matrix_generation = -1
+# (alias index generation, user ids, n) -> (top games, rendered table)
+_recommendation_cache = LRUCache(config.get('cache', {}).get('recommendation_max_size', 128))
 
-def update_scores(user_scores: Dict[str, Dict[str, int]]) -> int:
-    counter = 0
-    for alias, scores in user_scores.items():
-        user = user_mongo_client.find_user_by_alias(alias.upper())
-        user_mongo_client.add_games(user["_id"], scores)
-        logger.info(f"Updated scores for user {user}")
-        counter += 1
-    return counter
+
+SCORES_RANGE = "scores"
+
+
+def update_scores(user_scores: Dict[str, Dict[str, int]], force: bool = False) -> SyncReport:
+    """
+    Sync sheet scores to the database. Rows whose fingerprint matches the one
+    stored by the previous sync are skipped, and an unchanged sheet costs a
+    single read. Changed rows take two round trips: one query resolving every
+    alias to a user id and one unordered bulk write of all games maps.
+
+    Args:
+        user_scores: Sheet alias -> game -> score, as produced by map_to_scores.
+        force: Write every row even if its fingerprint is unchanged.
+
+    Returns:
+        SyncReport: Written/skipped rows, matched/modified users and aliases without a user.
+    """
+    report = SyncReport()
+    if not user_scores:
+        return report
+
+    aliases = {alias.upper(): alias for alias in user_scores}
+    row_fingerprints = {alias: fingerprint(user_scores[original])
+                        for alias, original in aliases.items()}
+    range_fingerprint = fingerprint(row_fingerprints)
+    stored = sheet_fingerprint_mongo_client.get_fingerprints(SCORES_RANGE)
+
+    if not force and stored.get(RANGE_KEY) == range_fingerprint:
+        report.skipped = len(aliases)
+        logger.info(f"Score sheet unchanged, skipped {report.skipped} rows")
+        return report
+
+    changed = {alias: original for alias, original in aliases.items()
+               if force or stored.get(alias) != row_fingerprints[alias]}
+    report.skipped = len(aliases) - len(changed)
+
+    alias_to_id = _resolve_user_ids(changed.keys())
+    games_by_user = {}
+    for alias, original in changed.items():
+        if alias not in alias_to_id:
+            report.unknown_aliases.append(original)
+            continue
+        games_by_user[alias_to_id[alias]] = user_scores[original]
+
+    result = user_mongo_client.bulk_add_games(games_by_user)
+    report.written = len(games_by_user)
+    if result:
+        report.matched = result.matched_count
+        report.modified = result.modified_count
+        alias_index.invalidate()
+
+    # Unknown aliases keep no fingerprint so they are retried once they're mapped
+    new_fingerprints = {alias: row_fingerprints[alias] for alias in changed if alias in alias_to_id}
+    if not report.unknown_aliases:
+        new_fingerprints[RANGE_KEY] = range_fingerprint
+    stale_keys = stored.keys() - row_fingerprints.keys() - {RANGE_KEY}
+    sheet_fingerprint_mongo_client.save_fingerprints(SCORES_RANGE, new_fingerprints, stale_keys)
+
+    if report.unknown_aliases:
+        logger.warning(f"No user found for sheet aliases {report.unknown_aliases}")
+    logger.info(f"Synced scores: {report}")
+    return report
+
+
+def _resolve_user_ids(aliases: Iterable[str]) -> Dict[str, str]:
+    wanted = set(aliases)
+    if not wanted:
+        return {}
+
+    alias_to_id = {}
+    for user in user_mongo_client.find_users_by_aliases(wanted):
+        for alias in user.get("aliases", []):
+            if alias in wanted:
+                alias_to_id[alias] = user["_id"]
+    return alias_to_id
 
 
 def get_top_games(users: list[User], n: int = 5) -> list[GameScore]:
-    scores = []
+    """
+    Get the n games with the highest total score for a group of users. Totals
+    come from the cached score matrix; GameScore is only built for the winners.
+    """
+    return _get_recommendation(users, n)[0]
+
+
+def get_recommendation(users: list[User], n: int = 5) -> str:
+    """
+    Get the rendered recommendation table for a group of users, or an empty
+    string if there is nothing to recommend.
+    """
+    return _get_recommendation(users, n)[1]
+
+
+def _get_recommendation(users: list[User], n: int) -> tuple[list[GameScore], str]:
     if not users:
-        return []
+        return [], ""
+
+    user_ids = [user.id for user in users]
+    matrix = _get_score_matrix()
+    if not all(user_id in matrix for user_id in user_ids):
+        # Users outside the index can't be cached as their data isn't versioned
+        games = _top_games(ScoreMatrix(users), users, n)
+        return games, get_recommendation_string(games) if games else ""
+
+    # update_scores invalidates the alias index; its next load bumps the generation
+    key = (alias_index.generation, frozenset(user_ids), n)
+    recommendation = _recommendation_cache.get(key)
+    if recommendation is None:
+        games = _top_games(matrix, users, n)
+        recommendation = (games, get_recommendation_string(games) if games else "")
+        _recommendation_cache.put(key, recommendation)
+    logger.info(f"Recommendation cache stats: {_recommendation_cache.stats()}")
+    return recommendation
+
+
+def _top_games(matrix: ScoreMatrix, users: list[User], n: int) -> list[GameScore]:
+    return [GameScore(game, users) for game, _ in matrix.top_games([user.id for user in users], n)]
+
 
-    for game in users[0].games:
-        game_score = GameScore(game, users)
-        heapq.heappush(scores, (game_score.score, game_score))
+def _get_score_matrix() -> ScoreMatrix:
+    global _score_matrix, _score_matrix_generation
 
-    return [game_score for _, game_score in heapq.nlargest(n, scores)]
+    if _score_matrix_generation != alias_index.generation:
+        _score_matrix = ScoreMatrix([to_user(user) for user in alias_index.users()])
+        _score_matrix_generation = alias_index.generation
+        _recommendation_cache.clear()
+        logger.info(f"Rebuilt score matrix of {len(_score_matrix.rows)} users "
+                    f"and {len(_score_matrix.games)} games")
+    return _score_matrix
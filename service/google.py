@@ -1,16 +1,18 @@
+import asyncio
 import logging
 import os
-from typing import Dict, List, Tuple
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-from google.cloud import secretmanager
-from google.cloud.secretmanager_v1beta2 import SecretManagerServiceClient
-from google.oauth2 import service_account
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from config import config
 
+# The client libraries are slow to import, so they're imported by the functions using them
+if TYPE_CHECKING:
+    from google.cloud.secretmanager import SecretManagerServiceClient
+    from google.oauth2.service_account import Credentials
+
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets",
           "https://www.googleapis.com/auth/cloud-platform"]
@@ -30,57 +32,134 @@ BOT_TOKEN_KEY = config["google"]["secrets"]["BOT_TOKEN"]
 
 logger = logging.getLogger(__name__)
 
-GOOGLE = None
+SHEETS_API = ("sheets", "v4")
+SHEETS_TIMEOUT_SECONDS = 30
+
 SHEETS = None
-SECRETS_CLIENT: SecretManagerServiceClient | None = None
+SECRETS_CLIENT: "SecretManagerServiceClient | None" = None
 BOT_TOKEN: str | None = None
-MONGO_TOKEN = None
+MONGO_TOKEN: str | None = None
 
+_credentials: "Credentials | None" = None
+_lock = threading.Lock()
+# httplib2 connections aren't thread safe, sheet requests share one and take turns
+_sheets_lock = threading.Lock()
 
-def init_google():
-    logger.info("Initializing google client")
-    global GOOGLE, SHEETS, SECRETS_CLIENT, BOT_TOKEN, MONGO_TOKEN
 
-    creds: Credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_KEY_PATH, scopes=SCOPES)
+async def fetch_tokens() -> Tuple[str, str]:
+    """
+    Fetch the bot and Mongo tokens from Secret Manager concurrently. Tokens that
+    were already fetched are reused.
 
-    try:
-        GOOGLE = build("sheets", "v4", credentials=creds)
-        SHEETS = GOOGLE.spreadsheets()
-        logger.info("Google Sheets API service created successfully")
-
-        SECRETS_CLIENT = secretmanager.SecretManagerServiceClient(
-            credentials=creds)
+    Returns:
+        The bot token and the Mongo token
+    """
+    global BOT_TOKEN, MONGO_TOKEN
 
+    async def fetch_bot_token():
         if ENV == "local":
             logger.info("Using local bot token")
-            BOT_TOKEN = os.getenv("LOCAL_BOT_TOKEN")
-        else:
-            BOT_TOKEN = get_secrets(BOT_TOKEN_KEY)
-
-        MONGO_TOKEN = get_secrets(MONGO_TOKEN_KEY)
+            return os.getenv("LOCAL_BOT_TOKEN")
+        return await asyncio.to_thread(get_secrets, BOT_TOKEN_KEY)
+
+    if BOT_TOKEN is None or MONGO_TOKEN is None:
+        BOT_TOKEN, MONGO_TOKEN = await asyncio.gather(
+            fetch_bot_token(), asyncio.to_thread(get_secrets, MONGO_TOKEN_KEY))
+
+    if not BOT_TOKEN:
+        raise ValueError("Missing bot token")
+    if not MONGO_TOKEN:
+        raise ValueError("Missing mongo token")
+    return BOT_TOKEN, MONGO_TOKEN
+
+
+def get_credentials() -> "Credentials":
+    from google.oauth2 import service_account
+
+    global _credentials
+    with _lock:
+        if _credentials is None:
+            _credentials = service_account.Credentials.from_service_account_file(
+                SERVICE_KEY_PATH, scopes=SCOPES)
+        return _credentials
+
+
+def get_sheets():
+    """
+    The Sheets API spreadsheets resource, built on first use. It is built from the
+    discovery document bundled with googleapiclient, so building needs no request,
+    and all requests go over one authorized keep-alive connection. Blocking.
+    """
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient import discovery_cache
+    from googleapiclient.discovery import build, build_from_document
+
+    global SHEETS
+    credentials = get_credentials()
+    with _lock:
+        if SHEETS is None:
+            http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=SHEETS_TIMEOUT_SECONDS))
+            document = discovery_cache.get_static_doc(*SHEETS_API)
+            if document is not None:
+                service = build_from_document(document, http=http)
+            else:
+                # build() would look for the bundled document again without static_discovery=False
+                logger.warning("No bundled Sheets discovery document, fetching it")
+                service = build(*SHEETS_API, http=http, static_discovery=False)
+            SHEETS = service.spreadsheets()
+            logger.info("Google Sheets API service created successfully")
+        return SHEETS
+
+
+def get_secrets_client() -> "SecretManagerServiceClient":
+    from google.cloud import secretmanager
 
-        if not BOT_TOKEN:
-            raise ValueError("Missing bot token")
-        if not MONGO_TOKEN:
-            raise ValueError("Missing mongo token")
-    except HttpError as err:
-        logger.error(f"HttpError occured: {err}")
+    global SECRETS_CLIENT
+    credentials = get_credentials()
+    with _lock:
+        if SECRETS_CLIENT is None:
+            SECRETS_CLIENT = secretmanager.SecretManagerServiceClient(credentials=credentials)
+        return SECRETS_CLIENT
 
 
 def get_secrets(secret_id, version_id="latest"):
-    global SECRETS_CLIENT
     logger.info(f"Getting {secret_id} from Secrets Manager")
     name = f"projects/{PROJECT_ID}/secrets/{secret_id}/versions/{version_id}"
-    response = SECRETS_CLIENT.access_secret_version(request={"name": name})
+    response = get_secrets_client().access_secret_version(request={"name": name})
     return response.payload.data.decode("UTF-8")
 
 
 def fetch_google_sheet_data(sheet_id, data_range) -> List[List[str]]:
     try:
         logger.info(f"Fetching data from {sheet_id} in range {data_range}")
-        result = SHEETS.values().get(spreadsheetId=sheet_id, range=data_range).execute()
+        request = get_sheets().values().get(spreadsheetId=sheet_id, range=data_range)
+        with _sheets_lock:
+            result = request.execute()
         return result.get("values", [])
     except HttpError as err:
         logger.error(f"HttpError occurred: {err}")
         raise
+
+
+async def fetch_google_sheet_ranges(sheet_id, *data_ranges) -> List[List[List[str]]]:
+    """
+    Fetch several ranges of a sheet with a single batchGet request, run in a
+    worker thread so the event loop shared with the gateway isn't blocked.
+
+    Returns:
+        The values of each range, in the order the ranges were given
+    """
+    return await asyncio.to_thread(_batch_get_google_sheet_data, sheet_id, list(data_ranges))
+
+
+def _batch_get_google_sheet_data(sheet_id, data_ranges: List[str]) -> List[List[List[str]]]:
+    try:
+        logger.info(f"Fetching data from {sheet_id} in ranges {data_ranges}")
+        request = get_sheets().values().batchGet(spreadsheetId=sheet_id, ranges=data_ranges)
+        with _sheets_lock:
+            result = request.execute()
+        return [value_range.get("values", []) for value_range in result.get("valueRanges", [])]
+    except HttpError as err:
+        logger.error(f"HttpError occurred: {err}")
+        raise
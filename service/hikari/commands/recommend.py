@@ -7,12 +7,12 @@ from hikari import ChannelType, Snowflake, VoiceState
 from hikari.api import CacheView
 
 from domain.User import User
-from persistence.mongo import mongo_client, user_mongo_client
 from persistence.EntityNotFoundError import EntityNotFoundError
 from persistence.mongo.user_mongo_client import to_user
 from service import game_service
-from service.hikari.hikari_bot import bot
-from utils.string_utils import format_name, get_recommendation_string
+from service.alias_index import alias_index
+from service.hikari.hikari_bot import get_bot
+from utils.string_utils import format_name
 
 loader = lightbulb.Loader()
 
@@ -43,13 +43,13 @@ class Recommend(
             await ctx.respond("You must be in a voice channel or provide users to recommend games for", ephemeral=True)
             return
         logger.info(f"Getting recommendations for users: {users}")
-        games = game_service.get_top_games(users, self.number)
+        recommendation = game_service.get_recommendation(users, self.number)
         response = ""
         if self.not_found_users:
             response += (f"I couldn't find any entries for the following users: "
                          f"{", ".join([alias for alias in self.not_found_users])}. "
                          f"Do they have entries on the google sheet?\n")
-        response += get_recommendation_string(games) if games else ""
+        response += recommendation
         self.not_found_users = []
         await ctx.respond(response)
 
@@ -57,6 +57,7 @@ class Recommend(
         if self.users is not None:
             return await self._query_aliases(self.users.split(","))
 
+        bot = get_bot()
         try:
             actor_voice_state = bot.cache.get_voice_state(
                 ctx.guild_id, ctx.interaction.member.id)
@@ -81,10 +82,7 @@ class Recommend(
             self,
             user_aliases: list[str]) -> list[User]:
         aliases = [user.strip().upper() for user in user_aliases]
-        tasks = [
-            asyncio.to_thread(
-                user_mongo_client.find_user_by_alias,
-                alias) for alias in aliases]
+        tasks = [alias_index.find_user_by_alias(alias) for alias in aliases]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         users: list[User] = []
@@ -121,7 +119,7 @@ class Recommend(
 
     async def _find_and_map_error(self, user_id: str, username: str):
         try:
-            return to_user(user_mongo_client.get_user(user_id))
+            return to_user(await alias_index.get_user(user_id))
         except EntityNotFoundError:
             logger.info(
                 f"User with id {user_id} and username {username} not found in database")
@@ -3,12 +3,14 @@ from typing import Union
 
 import lightbulb
 
-from persistence.mongo.wordle_mongo_client import get_top_winners, get_top_avg_scores
+from config import config
+from persistence.mongo.async_wordle_mongo_client import get_top_winners, get_top_avg_scores
 
 loader = lightbulb.Loader()
 
 logger = logging.getLogger(__name__)
 
+MIN_AVG_PLAY_COUNT = config.get('wordle', {}).get('min_avg_play_count', 10)
 
 WINS = lightbulb.Choice("wins", "wins")
 AVG = lightbulb.Choice("avg", "avg")
@@ -18,7 +20,7 @@ AVG = lightbulb.Choice("avg", "avg")
 class WordleRanks(
         lightbulb.SlashCommand,
         name="wordle_ranks",
-        description="Compute historical list of wordle scores. Not normalized by play count."):
+        description=f"Historical wordle ranks by wins, or by avg score of players with {MIN_AVG_PLAY_COUNT}+ games."):
     count: int = lightbulb.integer(
         "count",
         "Number of top scores to return. Default is 10.",
@@ -39,12 +41,13 @@ class WordleRanks(
 
         if self.type == WINS:
             logger.info(f"Computing top {self.count} wordle winners")
-            winners = get_top_winners(self.count)
+            winners = await get_top_winners(self.count)
             await context.respond(_format_results("Most wins:", winners))
         else:
             logger.info(f"Computing top {self.count} wordle average scores")
-            best_scorers = get_top_avg_scores(self.count)
-            await context.respond(_format_results("Best avg:", best_scorers))
+            best_scorers = await get_top_avg_scores(self.count, MIN_AVG_PLAY_COUNT)
+            await context.respond(_format_results(
+                f"Best avg (at least {MIN_AVG_PLAY_COUNT} games):", best_scorers))
 
         logger.info("Finished fetching wordle ranks")
 
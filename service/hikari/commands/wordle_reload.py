@@ -3,8 +3,8 @@ import logging
 import hikari
 import lightbulb
 
-from service.hikari.hikari_bot import bot
-from service.wordle_service import initialize_wordle_messages
+from service.hikari.hikari_bot import get_bot
+from service.wordle_backfill import wordle_backfill
 
 loader = lightbulb.Loader()
 
@@ -17,6 +17,11 @@ class WordleReload(
         name="wordle_reload",
         description="Force reload wordle scores.",
         default_member_permissions=hikari.Permissions.NONE):
+    full: bool = lightbulb.boolean(
+        "full",
+        "Rebuild from the whole channel history instead of only new messages. Default is False.",
+        default=False
+    )
 
     @lightbulb.invoke
     async def invoke(self, context: lightbulb.Context) -> None:
@@ -24,8 +29,10 @@ class WordleReload(
             f"Received command to reload wordle scores from {context.user.username} in {context.channel_id}")
         await context.defer(ephemeral=True)
 
-        response = await context.respond("Reloading wordle scores. This can take a while.", ephemeral=True)
-
-        await initialize_wordle_messages(bot)
-
-        await context.edit_response(response, "Reloaded wordle scores successfully.")
+        if wordle_backfill.start(get_bot(), self.full):
+            await context.respond("Reloading wordle scores in the background.", ephemeral=True)
+        else:
+            progress = wordle_backfill.progress
+            await context.respond(
+                f"A reload is already running: {progress.scanned} messages scanned, "
+                f"{progress.recorded} recorded so far.", ephemeral=True)
@@ -1,9 +1,10 @@
+import asyncio
 import logging
 
 import lightbulb
 
-from persistence.mongo import user_mongo_client
-from service.ascii_chart_service import format_table
+from service.yo_counter import yo_counter
+from service.yo_leaderboard import yo_leaderboard
 
 loader = lightbulb.Loader()
 logger = logging.getLogger(__name__)
@@ -18,6 +19,9 @@ class Yo(lightbulb.SlashCommand,
 
     @lightbulb.invoke
     async def invoke(self, ctx: lightbulb.Context) -> None:
-        users = user_mongo_client.find_users_by_yo_count(self.limit)
-        logger.info(f"Found top {len(users)} users by yo count: {users}")
-        await ctx.respond(format_table(users))
+        if not yo_leaderboard.loaded:
+            # the leaderboard only sees yos counted after it loaded
+            await yo_counter.flush()
+            await asyncio.to_thread(yo_leaderboard.load)
+        logger.info(f"Serving top {self.limit} users by yo count")
+        await ctx.respond(yo_leaderboard.chart(self.limit))
@@ -7,26 +7,44 @@ import lightbulb
 from hikari import Snowflake
 
 from config import config
-from service.google import init_google, BOT_TOKEN
 from service.hikari import commands
 from service.hikari.listener_handlers import handle_yo_message, handle_wordle_result
-from service.wordle_service import initialize_wordle_messages
+from service.wordle_backfill import wordle_backfill
 
 logger = logging.getLogger(__name__)
 
-if BOT_TOKEN is None:
-    init_google()
+# Created by create_bot once the token is known
+bot: hikari.GatewayBot | None = None
+client: lightbulb.GatewayEnabledClient | None = None
 
-bot = hikari.GatewayBot(BOT_TOKEN, intents=hikari.Intents.ALL)
-client = lightbulb.client_from_app(bot)
+
+def create_bot(token: str) -> hikari.GatewayBot:
+    """Create the bot and its lightbulb client and subscribe the listeners below."""
+    global bot, client
+    bot = hikari.GatewayBot(token, intents=hikari.Intents.ALL)
+    client = lightbulb.client_from_app(bot)
+    bot.subscribe(hikari.StartingEvent, on_starting)
+    bot.subscribe(hikari.StartedEvent, on_started)
+    bot.subscribe(hikari.GuildMessageCreateEvent, message)
+    return bot
+
+
+def get_bot() -> hikari.GatewayBot:
+    if bot is None:
+        raise RuntimeError("The bot has not been created yet")
+    return bot
 
 
 async def start_bot():
     logger.info("Starting bot")
-    bot_task = asyncio.create_task(bot.start())
+    bot_task = asyncio.create_task(get_bot().start())
+
+
+async def stop_bot():
+    if bot is not None:
+        await bot.close()
 
 
-@bot.listen(hikari.StartingEvent)
 async def on_starting(_: hikari.StartingEvent) -> None:
     logger.info("Loading extensions")
     # Load the commands
@@ -36,14 +54,12 @@ async def on_starting(_: hikari.StartingEvent) -> None:
     await client.start()
 
 
-@bot.listen(hikari.StartedEvent)
 async def on_started(_: hikari.StartedEvent) -> None:
-    # Initialize Wordle message cache at startup
+    # Catch up on Wordle messages in the background, see /wordle/backfill
     logger.info("Lightbulb client started")
-    await initialize_wordle_messages(bot)
+    wordle_backfill.start(bot)
 
 
-@bot.listen(hikari.GuildMessageCreateEvent)
 async def message(event: hikari.GuildMessageCreateEvent):
     if _is_valid_yo_message(event):
         return await handle_yo_message(event)
@@ -4,20 +4,20 @@ from datetime import datetime
 from hikari import GuildMessageCreateEvent, Snowflake
 from hikari.api import RESTClient
 
-from persistence.mongo.user_mongo_client import update_yo_count
-from persistence.mongo.wordle_mongo_client import update_wordle_entry
-from service.user_id_cache import username_cache
+from persistence.mongo.async_wordle_mongo_client import record_results, rebuild_totals
 from service.wordle_service import parse_wordle_message
+from service.yo_counter import yo_counter
 
 logger = logging.getLogger(__name__)
 
 
 async def handle_yo_message(event: GuildMessageCreateEvent):
     logger.info(f"Received yo from {event.message.author.display_name}")
-    user_count, counter = update_yo_count(event.message.author)
+    counter = await yo_counter.increment(event.message.author)
     total_count = counter['count']
     threshold: int = counter['threshold']
     if total_count % threshold == 0:
+        user_count = await yo_counter.get_user_count(event.message.author)
         start_date = datetime.fromtimestamp(counter['start_date'])
         start_date_string = start_date.strftime('%Y-%m-%d')
         now = datetime.now()
@@ -32,30 +32,20 @@ async def handle_yo_message(event: GuildMessageCreateEvent):
 async def handle_wordle_result(rest: RESTClient, event: GuildMessageCreateEvent):
     logger.info(
         f"Received wordle result from {event.message.author.display_name}")
-    result = await parse_wordle_message(rest, {}, event.message)
+    # Mentions are resolved while parsing, from the message itself where possible
+    unresolved: set[Snowflake] = set()
+    result = await parse_wordle_message(rest, {}, event.message, unresolved)
     logger.info(f"Parsed Wordle result: {result}")
-
-    for user in result.values():
-        username = user.name
-
-        if username.isdigit():
-            try:
-                logger.info(
-                    f"Found snowflake id for user name {username}, looking up user")
-                snowflake = Snowflake(int(username))
-                if snowflake in username_cache:
-                    username = username_cache[snowflake]
-                else:
-                    logger.info(f"Looking up user for id  {username}")
-                    discord_user = await event.app.rest.fetch_user(int(username))
-                    username = discord_user.display_name
-                    username_cache[snowflake] = username
-                logger.info(f"Resolved username: {username}")
-            except Exception as e:
-                logger.error(f"Failed to fetch user for id {username}: {e}")
-                continue
-
-        logger.info(
-            f"Updating Wordle stats for {username}: score={user.score_sum}, win={user.win_count > 0}")
-        # Update the user's Wordle stats in the database
-        update_wordle_entry(username, user.score_sum, user.win_count > 0)
+    if unresolved:
+        # Recording it without them would lose their day for good, the next backfill retries it
+        logger.warning(f"Not recording Wordle result {event.message.id}, could not resolve users {unresolved}")
+        return
+    users = list(result.values())
+
+    # The ledger applies each message once, even if a backfill also picked it up
+    if not await record_results(event.message.id, users):
+        logger.info(f"Wordle result {event.message.id} was already recorded")
+        return
+
+    logger.info(f"Updating Wordle stats for {[user.name for user in users]}")
+    await rebuild_totals([user.name for user in users])
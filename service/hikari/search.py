@@ -1,27 +1,144 @@
+import asyncio
 import logging
 import time
 import typing
+from contextlib import aclosing
 
 import hikari
 from hikari import Message, Snowflake
 
+from config import config
+
 logger = logging.getLogger(__name__)
 
+HISTORY_LIMIT = config.get('wordle', {}).get('history_limit', 10000)
+
+# Matching messages buffered ahead of the consumer while the next pages are fetched
+PREFETCH_SIZE = 200
+
+_DONE = object()
+
+
+async def stream_user_messages(
+        bot: hikari.GatewayBot,
+        channel_id: int,
+        predicate: typing.Callable[[Message], bool],
+        limit: int | None = HISTORY_LIMIT,
+        after: int | None = None,
+        before: int | None = None
+) -> typing.AsyncIterator[Message]:
+    """
+    Yield the messages in a channel that match a predicate as their pages arrive.
+
+    History is fetched by a background task, so the caller can process one page
+    while the next one is being fetched. Only matching messages are buffered.
+
+    Args:
+        bot: The Hikari bot instance
+        channel_id: The ID of the channel to search in
+        predicate: A function that takes a Message and returns True if it matches the search criteria
+        limit: The maximum number of messages to scan, or None for the whole history
+        after: Only scan messages newer than this message id. Messages are then yielded oldest first.
+        before: Only scan messages older than this message id
+
+    Close the returned generator, e.g. with contextlib.aclosing, to stop the background
+    fetch as soon as the caller is done, fails or is cancelled.
+
+    Yields:
+        Message objects that match the predicate
+
+    Raises:
+        Exception: Whatever fetching the channel or its history raised, after the
+            messages fetched before it were yielded
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PREFETCH_SIZE)
+    producer = asyncio.create_task(
+        _produce_messages(bot, channel_id, predicate, queue, limit, after, before))
+
+    try:
+        while True:
+            message = await queue.get()
+            if message is _DONE:
+                break
+            if isinstance(message, Exception):
+                raise message
+            yield message
+    finally:
+        producer.cancel()
+
+
+async def _produce_messages(
+        bot: hikari.GatewayBot,
+        channel_id: int,
+        predicate: typing.Callable[[Message], bool],
+        queue: asyncio.Queue,
+        limit: int | None,
+        after: int | None,
+        before: int | None) -> None:
+    try:
+        await _fetch_matching_messages(bot, channel_id, predicate, queue, limit, after, before)
+    except Exception as e:
+        # Handed to the consumer, so a cut-off crawl isn't mistaken for a complete one
+        await queue.put(e)
+        return
+    # Not reached when cancelled, the consumer is gone then
+    await queue.put(_DONE)
+
+
+async def _fetch_matching_messages(
+        bot: hikari.GatewayBot,
+        channel_id: int,
+        predicate: typing.Callable[[Message], bool],
+        queue: asyncio.Queue,
+        limit: int | None,
+        after: int | None,
+        before: int | None) -> None:
+    channel = await bot.rest.fetch_channel(Snowflake(channel_id))
+
+    # Verify the channel is a TextableChannel before fetching history
+    if not isinstance(channel, hikari.channels.TextableChannel):
+        logger.error(f"Channel {channel_id} is not a text channel")
+        return
+
+    # Discord only takes one bound, so with both the upper one is checked while iterating
+    if after:
+        history = channel.fetch_history(after=Snowflake(after))
+    elif before:
+        history = channel.fetch_history(before=Snowflake(before))
+    else:
+        history = channel.fetch_history()
+    if limit is not None:
+        history = history.limit(limit)
+
+    async for message in history:
+        if after and before and message.id >= before:
+            break
+        if predicate(message):
+            await queue.put(message)
+
 
 async def search_user_messages(
         bot: hikari.GatewayBot,
         channel_id: int,
-        predicate: typing.Callable[[Message], bool]
+        predicate: typing.Callable[[Message], bool],
+        after: int | None = None,
+        limit: int | None = HISTORY_LIMIT,
+        before: int | None = None
 ) -> list[Message]:
     """
     Search all messages in a channel that match a predicate function.
 
     Note: fetch_history() returns a LazyIterator that performs API calls as you iterate.
+    Prefer stream_user_messages to process messages while they are fetched. Unlike it,
+    this logs fetch errors and returns the messages found until then.
 
     Args:
         bot: The Hikari bot instance
         channel_id: The ID of the channel to search in
         predicate: A function that takes a Message and returns True if it matches the search criteria
+        after: Only search messages newer than this message id. Messages are then returned oldest first.
+        limit: The maximum number of messages to scan, or None for the whole history
+        before: Only search messages older than this message id
 
     Returns:
         List of Message objects that match the predicate
@@ -29,15 +146,9 @@ async def search_user_messages(
     start_time = time.time()
     messages = []
     try:
-        channel = await bot.rest.fetch_channel(Snowflake(channel_id))
-
-        # Verify the channel is a TextableChannel before fetching history
-        if not isinstance(channel, hikari.channels.TextableChannel):
-            logger.error(f"Channel {channel_id} is not a text channel")
-            return messages
-
-        async for message in channel.fetch_history().limit(10000):
-            if predicate(message):
+        async with aclosing(stream_user_messages(
+                bot, channel_id, predicate, limit=limit, after=after, before=before)) as stream:
+            async for message in stream:
                 messages.append(message)
     except Exception as e:
         logger.error(f"Error fetching messages from channel {channel_id}: {e}")
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable
+
+from attr import asdict
+
+from config import config
+from domain.JobStats import JobStats
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    """
+    Runs an async function every interval_seconds, give or take jitter, so jobs
+    started together drift apart. A run only starts once the previous one finished,
+    and each failure in a row doubles the delay up to max_backoff_seconds.
+    """
+
+    def __init__(self, name: str, run: Callable[[], Awaitable], interval_seconds: float,
+                 jitter: float, max_backoff_seconds: float):
+        self.name = name
+        self._run = run
+        self.jitter = jitter
+        self.max_backoff_seconds = max_backoff_seconds
+        self.stats = JobStats(interval_seconds=interval_seconds)
+        self._task: asyncio.Task | None = None
+
+    def next_delay(self) -> float:
+        """Seconds until the next run, with backoff and jitter applied."""
+        delay = self.stats.interval_seconds
+        if self.stats.consecutive_failures:
+            backoff = delay * 2 ** self.stats.consecutive_failures
+            delay = max(delay, min(backoff, self.max_backoff_seconds))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def run_once(self) -> None:
+        """Run the job once, recording how long it took and whether it failed."""
+        self.stats.running = True
+        self.stats.last_started_at = time.time()
+        start = time.perf_counter()
+        try:
+            await self._run()
+            self.stats.consecutive_failures = 0
+            self.stats.last_error = None
+        except Exception as e:
+            self.stats.failures += 1
+            self.stats.consecutive_failures += 1
+            self.stats.last_error = str(e)
+            logger.error(f"Scheduled job {self.name} failed: {e}")
+        finally:
+            self.stats.running = False
+            self.stats.runs += 1
+            self.stats.last_duration_seconds = time.perf_counter() - start
+        logger.info(f"Scheduled job {self.name} took {self.stats.last_duration_seconds:.3f}s")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the job, including a run in progress."""
+        if self._task is None or self._task.done():
+            return
+        self._task.cancel()
+        await asyncio.wait([self._task])
+        self.stats.next_run_at = None
+
+    async def _loop(self) -> None:
+        while True:
+            delay = self.next_delay()
+            self.stats.next_run_at = time.time() + delay
+            await asyncio.sleep(delay)
+            await self.run_once()
+
+
+class Scheduler:
+    """The in-process periodic jobs, configured under scheduler in config.yaml."""
+
+    def __init__(self, scheduler_config: dict):
+        self.jitter = scheduler_config.get('jitter', 0.1)
+        self.max_backoff_seconds = scheduler_config.get('max_backoff_seconds', 3600)
+        self._intervals = {name: job.get('interval_seconds', 0)
+                           for name, job in (scheduler_config.get('jobs') or {}).items()}
+        self.jobs: dict[str, ScheduledJob] = {}
+
+    def add(self, name: str, run: Callable[[], Awaitable]) -> ScheduledJob | None:
+        """
+        Schedule a job with the interval configured for its name.
+
+        Args:
+            name: The job name, as configured under scheduler.jobs
+            run: Called without arguments for every run
+
+        Returns:
+            The job, or None if no positive interval is configured for it
+        """
+        interval = self._intervals.get(name, 0)
+        if interval <= 0:
+            logger.info(f"Scheduled job {name} is disabled")
+            return None
+        job = ScheduledJob(name, run, interval, self.jitter, self.max_backoff_seconds)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        for job in self.jobs.values():
+            job.start()
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(job.stop() for job in self.jobs.values()))
+
+    def stats(self) -> dict[str, dict]:
+        """Job name -> its JobStats as a dict."""
+        return {name: asdict(job.stats) for name, job in self.jobs.items()}
+
+
+scheduler = Scheduler(config.get('scheduler', {}))
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+
+from domain.SyncReport import SyncReport
+from persistence.sheet_mapper import map_to_scores
+from service.game_service import update_scores
+from service.google import fetch_google_sheet_ranges, SHEET_ID, DATA_RANGE, USER_RANGE, END_ROW_TITLE
+from service.user_service import update_aliases
+
+logger = logging.getLogger(__name__)
+
+# Scheduled and requested syncs wait for each other instead of overlapping
+_sync_lock = asyncio.Lock()
+
+
+async def sync_sheet(force: bool = False) -> tuple[SyncReport, SyncReport]:
+    """
+    Read the alias and score ranges with one request and sync both to Mongo.
+
+    Args:
+        force: Write every row even if it is unchanged since the last sync
+
+    Returns:
+        The alias report and the score report
+    """
+    async with _sync_lock:
+        return await _sync_sheet(force)
+
+
+async def _sync_sheet(force: bool) -> tuple[SyncReport, SyncReport]:
+    logger.info("Reading updated user and data sheets")
+    user_data, score_data = await fetch_google_sheet_ranges(SHEET_ID, USER_RANGE, DATA_RANGE)
+    logger.debug(user_data)
+    alias_report = await asyncio.to_thread(update_aliases, user_data, force)
+    logger.info(f"Updated aliases for {alias_report.written} users, "
+                f"skipped {alias_report.skipped}")
+
+    score_map = map_to_scores(score_data, END_ROW_TITLE)
+    # A remapped alias changes which user a score row belongs to
+    score_report = await asyncio.to_thread(update_scores, score_map, force or alias_report.written > 0)
+    logger.info(f"Updated scores for {score_report.written} users, skipped {score_report.skipped}")
+    return alias_report, score_report
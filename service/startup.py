@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from persistence.mongo import mongo_client, wordle_mongo_client
+from persistence.mongo.indexes import ensure_indexes
+from service import google
+from service.alias_index import alias_index
+from service.hikari import hikari_bot
+from service.scheduler import scheduler
+from service.sheet_sync import sync_sheet
+from service.user_id_cache import username_cache
+from service.wordle_backfill import wordle_backfill
+from service.yo_counter import yo_counter
+from service.yo_leaderboard import yo_leaderboard
+
+logger = logging.getLogger(__name__)
+
+# Phase -> seconds it took during the last startup
+startup_timings: dict[str, float] = {}
+
+
+@asynccontextmanager
+async def _phase(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = time.perf_counter() - start
+
+
+async def start() -> None:
+    """
+    Bring the app up: fetch both tokens concurrently, connect to Mongo, warm the
+    in-memory caches concurrently, start the bot and schedule the periodic jobs.
+    The Sheets client is only built by the first sheet update. Timings of each
+    phase end up in startup_timings.
+    """
+    startup_timings.clear()
+    async with _phase("total"):
+        async with _phase("secrets"):
+            bot_token, mongo_token = await google.fetch_tokens()
+
+        async with _phase("mongo"):
+            await asyncio.to_thread(mongo_client.connect, mongo_token)
+
+        # before the bot starts, so no yo is counted twice or missed
+        await asyncio.gather(
+            _warm("alias_index", alias_index.load),
+            _warm("username_cache", username_cache.warm),
+            _warm("yo_leaderboard", yo_leaderboard.load),
+            _warm("indexes", _ensure_indexes))
+
+        async with _phase("bot"):
+            hikari_bot.create_bot(bot_token)
+            await hikari_bot.start_bot()
+
+        scheduler.add("sheet_sync", sync_sheet)
+        scheduler.add("wordle_reconcile", lambda: wordle_backfill.run(hikari_bot.get_bot()))
+        scheduler.start()
+
+    logger.info("Startup timings: " + ", ".join(
+        f"{name} {seconds:.3f}s" for name, seconds in startup_timings.items()))
+
+
+async def stop() -> None:
+    """Stop the scheduled jobs, the backfill and the bot, then write back what is still buffered."""
+    await scheduler.stop()
+    await wordle_backfill.cancel()
+    logger.info("Shutting down bot")
+    await hikari_bot.stop_bot()
+    await yo_counter.flush()
+    await username_cache.flush()
+
+
+async def _warm(name: str, load) -> None:
+    async with _phase(name):
+        try:
+            await asyncio.to_thread(load)
+        except Exception as e:
+            # Everything warmed here is also loaded lazily, so a failure isn't fatal
+            logger.error(f"Failed to warm {name}: {e}")
+
+
+def _ensure_indexes() -> None:
+    # Queries still work without indexes, only slower
+    ensure_indexes()
+    wordle_mongo_client.backfill_leaderboard_fields()
@@ -1,3 +1,86 @@
+import asyncio
+import logging
+import time
+
 from hikari import Snowflake
 
-username_cache: dict[Snowflake, str] = {}
+from config import config
+from persistence.mongo import username_mongo_client
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class UsernameCache:
+    """
+    Bounded cache of Discord user id -> display name. It is warmed from Mongo at
+    startup, and new names are written back in the background so a restart
+    doesn't have to fetch every user from Discord again.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float | None = None):
+        self._cache = LRUCache(maxsize, ttl_seconds)
+        # names resolved since the last write back
+        self._pending: dict[Snowflake, str] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def get(self, snowflake: Snowflake) -> str | None:
+        return self._cache.get(snowflake)
+
+    def __contains__(self, snowflake: Snowflake) -> bool:
+        return snowflake in self._cache
+
+    def __getitem__(self, snowflake: Snowflake) -> str:
+        name = self._cache.get(snowflake)
+        if name is None:
+            raise KeyError(snowflake)
+        return name
+
+    def __setitem__(self, snowflake: Snowflake, name: str) -> None:
+        self._cache.put(snowflake, name)
+        self._pending[snowflake] = name
+        try:
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            # no running loop, the next flush picks the name up
+            pass
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def warm(self) -> int:
+        """
+        Load stored names from Mongo. Blocking. A name expires ttl_seconds after it was
+        resolved, not after it was loaded, so restarts don't keep old names alive.
+        Returns the number of names loaded.
+        """
+        now = time.time()
+        ttl_seconds = self._cache.ttl_seconds
+        names = username_mongo_client.get_usernames(
+            self._cache.maxsize, now - ttl_seconds if ttl_seconds is not None else None)
+        # least recently resolved first, so they're evicted first
+        for user_id, (name, resolved_at) in reversed(names.items()):
+            self._cache.put(Snowflake(user_id), name, now - resolved_at if resolved_at else 0)
+        logger.info(f"Warmed username cache with {len(names)} names")
+        return len(names)
+
+    async def flush(self) -> None:
+        """Write names resolved since the last flush back to Mongo."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            await asyncio.to_thread(username_mongo_client.save_usernames, pending)
+        except Exception as e:
+            logger.error(f"Failed to save {len(pending)} usernames: {e}")
+            self._pending = pending | self._pending
+
+    def stats(self) -> dict[str, float]:
+        return self._cache.stats()
+
+
+cache_config = config.get('cache', {})
+username_cache = UsernameCache(
+    cache_config.get('username_max_size', 1000),
+    cache_config.get('username_ttl_seconds'))
@@ -1,14 +1,52 @@
 import logging
 
-from persistence.mongo.user_mongo_client import add_aliases
+from domain.SyncReport import SyncReport
+from persistence.mongo import sheet_fingerprint_mongo_client
+from persistence.mongo.sheet_fingerprint_mongo_client import RANGE_KEY
+from persistence.mongo.user_mongo_client import bulk_add_aliases
+from persistence.sheet_mapper import fingerprint
+from service.alias_index import alias_index
 
 logger = logging.Logger(__name__)
 
+ALIASES_RANGE = "aliases"
 
-def update_aliases(data: list[list[str]]) -> int:
-    counter = 0
+
+def update_aliases(data: list[list[str]], force: bool = False) -> SyncReport:
+    """
+    Sync the id-mapping sheet to user aliases. Aliases are only ever added, so
+    the whole range is written in one bulk write when its fingerprint changed
+    and skipped otherwise.
+
+    Args:
+        data: Sheet rows of user id followed by aliases.
+        force: Write the range even if its fingerprint is unchanged.
+
+    Returns:
+        SyncReport: Written or skipped user rows.
+    """
+    report = SyncReport()
+    aliases_by_user: dict[str, list[str]] = {}
     for row in data:
-        logger.info("Updating aliases for user with id: %s", row[0])
-        add_aliases(row[0], *row[1:])
-        counter += 1
-    return counter
+        if not row or not row[0]:
+            continue
+        aliases_by_user.setdefault(row[0], []).extend(row[1:])
+
+    range_fingerprint = fingerprint(aliases_by_user)
+    stored = sheet_fingerprint_mongo_client.get_fingerprints(ALIASES_RANGE)
+    if not force and stored.get(RANGE_KEY) == range_fingerprint:
+        report.skipped = len(aliases_by_user)
+        logger.info("Alias sheet unchanged, skipped %d rows", report.skipped)
+        return report
+
+    logger.info("Updating aliases for %d users", len(aliases_by_user))
+    result = bulk_add_aliases(aliases_by_user)
+    report.written = len(aliases_by_user)
+    if result:
+        report.matched = result.matched_count
+        report.modified = result.modified_count + result.upserted_count
+        alias_index.invalidate()
+
+    sheet_fingerprint_mongo_client.save_fingerprints(
+        ALIASES_RANGE, {RANGE_KEY: range_fingerprint})
+    return report
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from hikari import Snowflake, User
+from hikari.api import Cache, RESTClient
+
+from config import config
+from service.user_id_cache import username_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_FETCHES = config.get('wordle', {}).get('max_concurrent_user_fetches', 5)
+
+# Snowflake -> fetch in progress, so concurrent callers share one request per user
+_in_flight: dict[Snowflake, asyncio.Task] = {}
+# Shared by every caller, so live results and a backfill together stay within the bound
+_semaphore: asyncio.Semaphore | None = None
+
+
+def remember_users(users: Iterable[User]) -> None:
+    """
+    Cache the display names of users Discord already sent along, e.g. a message's
+    mentions, so resolving them doesn't need a request.
+
+    Args:
+        users: The resolved users
+    """
+    for user in users:
+        if username_cache.get(user.id) != user.display_name:
+            username_cache[user.id] = user.display_name
+
+
+async def resolve_usernames(rest: RESTClient,
+                            snowflakes: Iterable[Snowflake],
+                            cache: Cache | None = None) -> dict[Snowflake, str]:
+    """
+    Resolve user ids to display names. Names in the username cache or the bot's
+    member cache are used without a request, the rest are fetched concurrently,
+    at most MAX_CONCURRENT_FETCHES at a time across all callers and never more than
+    once per id. Cancelling one caller doesn't cancel fetches others are waiting for.
+
+    Args:
+        rest: The REST client to fetch users with
+        snowflakes: The user ids to resolve, duplicates are fine
+        cache: The bot's cache of guild members, if it has one
+
+    Returns:
+        Snowflake -> display name. Ids that failed to resolve are missing.
+    """
+    names: dict[Snowflake, str] = {}
+    pending: dict[Snowflake, asyncio.Task] = {}
+
+    for snowflake in set(snowflakes):
+        name = username_cache.get(snowflake)
+        if name is not None:
+            names[snowflake] = name
+            continue
+
+        cached_user = cache.get_user(snowflake) if cache is not None else None
+        if isinstance(cached_user, User):
+            username_cache[snowflake] = names[snowflake] = cached_user.display_name
+            continue
+
+        task = _in_flight.get(snowflake)
+        if task is None:
+            task = asyncio.create_task(_fetch_username(rest, snowflake))
+            _in_flight[snowflake] = task
+            task.add_done_callback(lambda _, key=snowflake: _in_flight.pop(key, None))
+        pending[snowflake] = task
+
+    if pending:
+        logger.info(f"Fetching {len(pending)} unknown users, username cache stats: {username_cache.stats()}")
+        for snowflake, name in zip(pending, await asyncio.gather(*map(asyncio.shield, pending.values()))):
+            if name is not None:
+                names[snowflake] = name
+    return names
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    return _semaphore
+
+
+async def _fetch_username(rest: RESTClient, snowflake: Snowflake) -> str | None:
+    async with _get_semaphore():
+        try:
+            discord_user = await rest.fetch_user(snowflake)
+        except Exception as e:
+            logger.error(f"Failed to fetch user for id {snowflake}: {e}")
+            return None
+
+    username_cache[snowflake] = discord_user.display_name
+    return discord_user.display_name
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+
+import hikari
+
+from domain.BackfillProgress import BackfillProgress, CANCELLED, DONE, FAILED, RUNNING
+from service.wordle_service import initialize_wordle_messages
+
+logger = logging.getLogger(__name__)
+
+
+class WordleBackfill:
+    """
+    Runs the Wordle history crawl as a background task, so neither the gateway's
+    started event nor /wordle_reload waits for it. At most one crawl runs at a time
+    and its progress is kept for the status endpoint.
+    """
+
+    def __init__(self):
+        self.progress = BackfillProgress()
+        self._task: asyncio.Task | None = None
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, bot: hikari.GatewayBot, full_rebuild: bool = False) -> bool:
+        """
+        Start crawling the Wordle messages in the background.
+
+        Args:
+            bot: The Hikari bot instance
+            full_rebuild: Search the whole channel history and recompute every total
+
+        Returns:
+            False if a crawl is already running, it is left to finish
+        """
+        if self.is_running():
+            return False
+        self.progress = BackfillProgress(state=RUNNING, full_rebuild=full_rebuild, started_at=time.time())
+        self._task = asyncio.create_task(self._run(bot, self.progress))
+        return True
+
+    async def wait(self) -> BackfillProgress:
+        """Wait for the running crawl, if any, and return its progress."""
+        if self._task is not None:
+            await asyncio.wait([self._task])
+        return self.progress
+
+    async def run(self, bot: hikari.GatewayBot) -> BackfillProgress:
+        """
+        Crawl new Wordle messages and wait for it, or wait for the crawl already running.
+
+        Raises:
+            RuntimeError: If the crawl failed
+        """
+        self.start(bot)
+        progress = await self.wait()
+        if progress.state == FAILED:
+            raise RuntimeError(f"Wordle backfill failed: {progress.error}")
+        return progress
+
+    async def cancel(self) -> None:
+        """Stop the running crawl. Messages of finished batches stay recorded."""
+        if not self.is_running():
+            return
+        self._task.cancel()
+        await asyncio.wait([self._task])
+
+    async def _run(self, bot: hikari.GatewayBot, progress: BackfillProgress) -> None:
+        try:
+            await initialize_wordle_messages(bot, progress.full_rebuild, progress)
+            progress.state = FAILED if progress.error else DONE
+        except asyncio.CancelledError:
+            progress.state = CANCELLED
+            logger.info(f"Cancelled Wordle backfill after {progress.scanned} messages")
+            raise
+        finally:
+            progress.finished_at = time.time()
+        logger.info(f"Wordle backfill {progress.state}: {progress.scanned} scanned, {progress.parsed} parsed, "
+                    f"{progress.recorded} recorded, {progress.users_updated} users updated")
+
+
+wordle_backfill = WordleBackfill()
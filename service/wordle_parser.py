@@ -0,0 +1,53 @@
+import re
+
+# Attempts counted for a failed game (X/6)
+FAILED_ATTEMPTS = 7
+
+# One pass over the whole message body, each match is either
+# a score block start (e.g. "4/6:", "X/6:") or a mention (e.g. "@Alice", "<@123>").
+# Mentions stop at the end of the line, so a block can continue on the next lines.
+TOKEN_PATTERN = re.compile(r"(\d+|X)/6:|@([\w \t]+)")
+
+
+def tokenize_results(content: str) -> list[tuple[int, list[str]]]:
+    """
+    Split the body of a Wordle result message into its score blocks.
+
+    Mentions before the first score block are ignored. Mentions of Discord users
+    are returned as their user id, e.g. "123" for "<@123>".
+
+    Args:
+        content: The message content
+
+    Returns:
+        One (attempts, [mentions]) group per score block, in message order.
+        Failed games count as FAILED_ATTEMPTS.
+    """
+    groups: list[tuple[int, list[str]]] = []
+    mentions: list[str] | None = None
+
+    for attempts, mention in TOKEN_PATTERN.findall(content):
+        if attempts:
+            mentions = []
+            groups.append((int(attempts) if attempts != "X" else FAILED_ATTEMPTS, mentions))
+        elif mentions is not None:
+            mention = mention.strip()
+            if mention:
+                mentions.append(mention)
+
+    return groups
+
+
+def parse_results(content: str) -> list[tuple[int, str]]:
+    """
+    Flatten the score blocks of a Wordle result message into (attempts, mention) pairs.
+
+    Args:
+        content: The message content
+
+    Returns:
+        One (attempts, mention) pair per player, in message order
+    """
+    return [(attempts, mention)
+            for attempts, mentions in tokenize_results(content)
+            for mention in mentions]
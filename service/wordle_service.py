@@ -1,17 +1,20 @@
 # Create a predicate to filter messages from the Wordle app user
 import logging
 import os
-import re
+from collections.abc import Mapping
+from contextlib import aclosing
 
 import hikari
 from hikari import Message, Snowflake
 from hikari.api import RESTClient
 
 from config import config
+from domain.BackfillProgress import BackfillProgress
 from domain.Wordle import WordleUser
-from persistence.mongo import wordle_mongo_client
-from service.hikari.search import search_user_messages
-from service.user_id_cache import username_cache
+from persistence.mongo import async_wordle_mongo_client
+from service.hikari.search import stream_user_messages
+from service.username_resolver import remember_users, resolve_usernames
+from service.wordle_parser import parse_results
 
 logger = logging.getLogger(__name__)
 
@@ -24,47 +27,86 @@ else:
     channel_id = discord_config.get('channel_id')
     wordle_user_id = discord_config.get('wordle_app_user_id')
 
+INGEST_BATCH_SIZE = config.get('wordle', {}).get('ingest_batch_size', 100)
 
-# Pattern to detect the start of a score block (e.g., "4/6:", "X/6:", potentially indented)
-# Group 1: (\d+|X) -> The score (e.g., '4', 'X')
-SCORE_START_PATTERN = re.compile(r"(\d+|X)\/6:", re.MULTILINE)
 
-# Pattern to extract names from any line:
-NAME_PATTERN = re.compile(r"@([\w\s]+)")
-
-
-async def initialize_wordle_messages(bot: hikari.GatewayBot) -> None:
+async def initialize_wordle_messages(bot: hikari.GatewayBot,
+                                     full_rebuild: bool = False,
+                                     progress: BackfillProgress | None = None) -> BackfillProgress:
     """
-    Initialize by fetching all Wordle bot messages at startup.
+    Ingest Wordle bot messages posted since the last finished crawl.
 
     This searches the configured Discord channel for messages from the Wordle app user
-    and processes them to extract and store game scores in MongoDB.
+    newer than the completed-through mark, records each message's results in the
+    ledger and recomputes the totals of everyone in them. Messages already in the ledger
+    are never applied twice, so this is safe to run while results arrive live. The mark
+    only moves once the crawl finished, so an interrupted crawl is redone from the same
+    point, including the older messages it never reached.
 
     Args:
         bot: The Hikari bot instance
+        full_rebuild: Search the whole channel history and recompute every total
+        progress: Updated as messages are ingested, e.g. for a status endpoint
+
+    Returns:
+        The progress, with error set if the ingestion failed
     """
+    progress = progress if progress is not None else BackfillProgress(full_rebuild=full_rebuild)
     try:
         if not channel_id or not wordle_user_id:
             logger.warning(
                 "Discord channel_id or wordle_app_user_id not configured")
-            return
-
-        logger.info(f"Fetching Wordle messages from channel {channel_id}")
-
-        messages = await search_user_messages(bot, channel_id, is_wordle_message)
-        logger.info(f"Cached {len(messages)} Wordle messages")
-
-        user_dict: dict[str, WordleUser] = {}
-
-        for message in messages:
-            await parse_wordle_message(bot.rest, user_dict, message)
-
-        for wordle_user in user_dict.values():
-            logger.info(f"Saving user {wordle_user}")
-            wordle_mongo_client.insert(wordle_user)
+            return progress
+
+        completed_through = None if full_rebuild else await async_wordle_mongo_client.get_completed_through()
+        logger.info(f"Fetching Wordle messages from channel {channel_id} after {completed_through}")
+
+        names: set[str] = set()
+        # Message id -> user ids that couldn't be resolved, those messages aren't recorded
+        unresolved: dict[Snowflake, set[Snowflake]] = {}
+        batch: list[Message] = []
+        newest_id = None
+        # Closed on any exit, so a failed or cancelled crawl stops fetching right away
+        async with aclosing(stream_user_messages(
+                bot, channel_id, is_wordle_message, after=completed_through)) as messages:
+            # Each batch is parsed and recorded while the stream fetches the next pages
+            async for message in messages:
+                progress.scanned += 1
+                newest_id = max(newest_id or 0, int(message.id))
+                batch.append(message)
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    await _record_batch(bot.rest, batch, names, unresolved, progress)
+                    batch = []
+        if batch:
+            await _record_batch(bot.rest, batch, names, unresolved, progress)
+        logger.info(f"Recorded {progress.recorded} new of {progress.scanned} Wordle messages, "
+                    f"skipped {progress.unresolved} with unresolved users")
+
+        # Only reached once the whole history was read, a failed crawl raised above
+        if full_rebuild:
+            progress.users_updated = await async_wordle_mongo_client.rebuild_totals()
+        elif names:
+            # Includes messages an interrupted crawl recorded without recomputing their totals
+            progress.users_updated = await async_wordle_mongo_client.rebuild_totals(names)
+        # A skipped message is read again by the next crawl, so the mark stays before it
+        mark = min(unresolved) - 1 if unresolved else newest_id
+        if mark:
+            await async_wordle_mongo_client.set_completed_through(mark)
 
     except Exception as e:
         logger.error(f"Failed to initialize Wordle messages: {e}")
+        progress.error = str(e)
+    return progress
+
+
+async def _record_batch(rest: RESTClient, messages: list[Message], names: set[str],
+                        unresolved: dict[Snowflake, set[Snowflake]], progress: BackfillProgress):
+    results = await parse_wordle_messages(rest, messages, unresolved)
+    progress.parsed += len(messages)
+    progress.unresolved = len(unresolved)
+    recorded = await async_wordle_mongo_client.bulk_record_results(results)
+    progress.recorded += recorded
+    names.update(user.name for message_users in results.values() for user in message_users)
 
 
 def is_wordle_message(message: Message) -> bool:
@@ -73,68 +115,116 @@ def is_wordle_message(message: Message) -> bool:
     return author_matches and content_matches
 
 
-async def parse_wordle_message(rest: RESTClient, user_dict: dict[str, WordleUser], message: Message):
-    # min_attempts needed to figure out winners since we're iterating line by line
-    attempts = 0
-    min_attempts = 7
-    logger.info(f"Processing Wordle message: {message.id}: {message.content}")
+async def parse_wordle_message(rest: RESTClient, user_dict: dict[str, WordleUser], message: Message,
+                               unresolved: set[Snowflake] | None = None):
+    """
+    Parse one Wordle result message and add its results to user_dict.
+
+    Args:
+        rest: The REST client used to resolve mentioned user ids
+        user_dict: Name -> WordleUser to accumulate results into
+        message: The Wordle result message
+        unresolved: Collects mentioned user ids that couldn't be resolved. Their
+            results are missing from user_dict, so the message shouldn't be recorded.
+
+    Returns:
+        user_dict
+    """
+    results = _parse_results(message)
+    _remember_mentions(message)
+    names = await resolve_usernames(rest, _unresolved_snowflakes(results), _member_cache(message))
+    _apply_results(user_dict, results, names, unresolved)
+    return user_dict
+
+
+async def parse_wordle_messages(rest: RESTClient, messages: list[Message],
+                                unresolved: dict[Snowflake, set[Snowflake]] | None = None
+                                ) -> dict[Snowflake, list[WordleUser]]:
+    """
+    Parse a batch of Wordle result messages. User ids mentioned anywhere in the
+    batch are collected first and resolved together before any results are applied.
+    Users are only fetched when neither a message's mentions nor the member cache know them.
+
+    Args:
+        rest: The REST client used to resolve mentioned user ids
+        messages: The Wordle result messages
+        unresolved: Collects message id -> mentioned user ids that couldn't be resolved
 
-    for line in message.content.splitlines():
-        logger.info(f"Processing line: {line}")
-        line = line.strip()
-        if not line:
+    Returns:
+        Message id -> one WordleUser per player of that message, only for messages
+        whose players were all resolved
+    """
+    parsed = [(message, _parse_results(message)) for message in messages]
+    for message in messages:
+        _remember_mentions(message)
+    snowflakes = {snowflake for _, results in parsed for snowflake in _unresolved_snowflakes(results)}
+    names = await resolve_usernames(rest, snowflakes, _member_cache(messages[0]) if messages else None)
+
+    message_results: dict[Snowflake, list[WordleUser]] = {}
+    for message, results in parsed:
+        missing: set[Snowflake] = set()
+        users = _apply_results({}, results, names, missing)
+        if missing:
+            logger.warning(f"Skipping Wordle message {message.id}, could not resolve users {missing}")
+            if unresolved is not None:
+                unresolved[message.id] = missing
             continue
+        message_results[message.id] = list(users.values())
+    return message_results
+
+
+def _parse_results(message: Message) -> list[tuple[int, str]]:
+    """
+    Extract (attempts, name) pairs from a Wordle result message. Failed games
+    count as 7 attempts and names may still be user ids.
+    """
+    logger.debug("Processing Wordle message: %s", message.id)
+    return parse_results(message.content)
+
+
+def _remember_mentions(message: Message) -> None:
+    # Discord sends the mentioned users along with the message, except on some updates
+    mentions = message.user_mentions
+    if isinstance(mentions, Mapping):
+        remember_users(mentions.values())
+
+
+def _member_cache(message: Message) -> hikari.api.Cache | None:
+    app = message.app
+    return app.cache if isinstance(app, hikari.traits.CacheAware) else None
+
+
+def _unresolved_snowflakes(results: list[tuple[int, str]]) -> set[Snowflake]:
+    return {Snowflake(int(name)) for _, name in results if name.isdigit()}
+
+
+def _apply_results(user_dict: dict[str, WordleUser],
+                   results: list[tuple[int, str]],
+                   names: dict[Snowflake, str],
+                   unresolved: set[Snowflake] | None = None) -> dict[str, WordleUser]:
+    # the lowest number of attempts in a message wins the day
+    min_attempts = min((attempts for attempts, _ in results), default=7)
+
+    for attempts, name in results:
+        if name.isdigit():
+            snowflake = Snowflake(int(name))
+            name = names.get(snowflake)
+            if name is None:
+                # lookup failed and was logged by the resolver
+                if unresolved is not None:
+                    unresolved.add(snowflake)
+                continue
+
+        user = user_dict.get(name)
+        if user is None:
+            user = WordleUser(name=name)
+            user_dict[name] = user
+
+        user.play_count += 1
+        if attempts == min_attempts and attempts <= 6:
+            user.win_count += 1
 
-        if SCORE_START_PATTERN.search(line):
-            # matched score line, e.x. "4/6: @UserA @UserB"
-            parsed_attempt = SCORE_START_PATTERN.search(line).group(1)
-            attempts = int(parsed_attempt) if parsed_attempt.isdigit() else 7
-            min_attempts = min(min_attempts, attempts)
-            logger.info(
-                f"Matched score line: attempts: {attempts}, min_attempts: {min_attempts}")
-
-        # Extract individual user names
-        for name_match in NAME_PATTERN.finditer(line):
-            name = name_match.group(1).strip()  # Name without '@'
-
-            if name.isdigit():
-                try:
-                    logger.info(
-                        f"Found snowflake id for user name {name}, looking up user")
-                    snowflake = Snowflake(int(name))
-                    if snowflake in username_cache:
-                        name = username_cache[snowflake]
-                    else:
-                        logger.info(f"Looking up user for id  {name}")
-                        discord_user = await rest.fetch_user(int(name))
-                        name = discord_user.display_name
-                        username_cache[snowflake] = name
-                    logger.info(f"Resolved username: {name}")
-                except Exception as e:
-                    logger.error(f"Failed to fetch user for id {name}: {e}")
-                    continue
-
-            # 4. Get or initialize the WordleUser object
-            user = user_dict.get(name)
-            if user is None:
-                user = WordleUser(name=name)
-                user_dict[name] = user
-
-            logger.info(
-                f"Updating user {name} with score {attempts} and min_attempts {min_attempts}")
-
-            # 5. Update the user stats
-            logger.info(f"Incrementing play_count for user {name}")
-            user.play_count += 1
-
-            if attempts == min_attempts and attempts <= 6:
-                logger.info(f"Incrementing win_count for user {name}")
-                user.win_count += 1
-
-            # TODO: consider score calculation penalty for failures or adjusted for play count
-            score_increment = attempts if attempts <= 6 else 7
-            logger.info(
-                f"Incrementing score_sum for user {name} by {score_increment}")
-            user.score_sum += score_increment
+        # TODO: consider score calculation penalty for failures or adjusted for play count
+        user.score_sum += attempts if attempts <= 6 else 7
 
     return user_dict
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+import hikari
+
+from config import config
+from persistence.EntityNotFoundError import EntityNotFoundError
+from persistence.mongo import async_user_mongo_client
+from service.yo_leaderboard import yo_leaderboard
+
+logger = logging.getLogger(__name__)
+
+
+class YoCounter:
+    """
+    Counts yos in memory and writes them to Mongo in one bulk write once
+    flush_size yos are waiting or flush_interval_seconds after the first one.
+    The global count is tracked locally, so milestones are exact between writes.
+    """
+
+    def __init__(self, flush_size: int, flush_interval_seconds: float):
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        # User ID -> (display name, yos not written yet)
+        self._pending: dict[str, tuple[str, int]] = {}
+        self._pending_total = 0
+        # The yo-counter document, its count includes the pending yos
+        self._counter: dict | None = None
+        self._load_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        # Resolved to flush before the interval is up
+        self._flush_early: asyncio.Future | None = None
+
+    async def increment(self, author: hikari.users.User) -> dict:
+        """
+        Count a yo from author.
+
+        Args:
+            author: The user who said yo
+
+        Returns:
+            A copy of the yo-counter document including this yo
+        """
+        counter = await self._load_counter()
+        counter['count'] += 1
+
+        user_id = str(author.id)
+        _, count = self._pending.get(user_id, (None, 0))
+        self._pending[user_id] = (author.display_name, count + 1)
+        self._pending_total += 1
+        yo_leaderboard.add(user_id, author.display_name)
+        self._schedule_flush()
+        return dict(counter)
+
+    async def get_user_count(self, author: hikari.users.User) -> int:
+        """Write pending yos, then read the total yo count of author."""
+        await self.flush()
+        user_id = str(author.id)
+        try:
+            user = await async_user_mongo_client.get_user(user_id)
+        except EntityNotFoundError:
+            user = {}
+        # yos of a failed write are still pending
+        _, pending = self._pending.get(user_id, (None, 0))
+        return user.get('yo_count', 0) + pending
+
+    async def flush(self) -> None:
+        """Write the pending yos to Mongo."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._pending_total = 0
+        try:
+            await async_user_mongo_client.bulk_add_yo_counts(pending)
+            logger.info(f"Saved {sum(count for _, count in pending.values())} yos of {len(pending)} users")
+        except Exception as e:
+            logger.error(f"Failed to save yos of {len(pending)} users: {e}")
+            for user_id, (display_name, count) in pending.items():
+                display_name, newer = self._pending.get(user_id, (display_name, 0))
+                self._pending[user_id] = (display_name, count + newer)
+                self._pending_total += count
+
+    def pending_count(self) -> int:
+        return self._pending_total
+
+    async def _load_counter(self) -> dict:
+        async with self._load_lock:
+            if self._counter is None:
+                counter = await async_user_mongo_client.get_yo_counter()
+                self._counter = counter or {"_id": "yo-counter", "count": 0}
+        return self._counter
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_early = asyncio.get_running_loop().create_future()
+            self._flush_task = asyncio.create_task(self._flush_later())
+        if self._pending_total >= self.flush_size and not self._flush_early.done():
+            self._flush_early.set_result(None)
+
+    async def _flush_later(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_early, self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+            # yos counted during the write, or put back by a failed one
+            if not self._pending:
+                return
+            self._flush_early = asyncio.get_running_loop().create_future()
+
+
+yo_config = config.get('yo', {})
+yo_counter = YoCounter(
+    yo_config.get('flush_size', 20),
+    yo_config.get('flush_interval_seconds', 30))
@@ -0,0 +1,55 @@
+import heapq
+import logging
+
+from config import config
+from persistence.mongo import user_mongo_client
+from service.ascii_chart_service import format_table
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class YoLeaderboard:
+    """
+    In-memory yo counts of everyone who said yo. It is loaded from Mongo once and
+    then kept current by the yo counter, so /yo is answered without a query.
+    Rendered charts are cached per limit until the next yo.
+    """
+
+    def __init__(self, chart_cache_size: int):
+        # User ID -> {'_id', 'display_name', 'yo_count'}, like find_users_by_yo_count
+        self._users: dict[str, dict] = {}
+        self._charts = LRUCache(chart_cache_size)
+        self.loaded = False
+
+    def load(self) -> None:
+        """Replace the counts with the ones stored in Mongo. Blocking."""
+        # a limit of 0 returns every user
+        self._users = {user['_id']: user for user in user_mongo_client.find_users_by_yo_count(0)}
+        self._charts.clear()
+        self.loaded = True
+        logger.info(f"Loaded yo leaderboard with {len(self._users)} users")
+
+    def add(self, user_id: str, display_name: str, count: int = 1) -> None:
+        """Count yos from a user. Ignored until the leaderboard is loaded."""
+        if not self.loaded:
+            return
+        user = self._users.setdefault(user_id, {'_id': user_id, 'yo_count': 0})
+        user['display_name'] = display_name
+        user['yo_count'] += count
+        self._charts.clear()
+
+    def top(self, limit: int) -> list[dict]:
+        """The limit users with the most yos, most first."""
+        return heapq.nlargest(limit, self._users.values(), key=lambda user: user['yo_count'])
+
+    def chart(self, limit: int) -> str:
+        """The rendered chart of the top limit users."""
+        chart = self._charts.get(limit)
+        if chart is None:
+            chart = format_table(self.top(limit))
+            self._charts.put(limit, chart)
+        return chart
+
+
+yo_leaderboard = YoLeaderboard(config.get('cache', {}).get('yo_chart_max_size', 16))
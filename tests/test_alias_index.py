@@ -0,0 +1,102 @@
+# test_alias_index.py
+import mongomock
+import pytest
+
+from persistence.EntityNotFoundError import EntityNotFoundError
+from persistence.mongo import user_mongo_client
+from service.alias_index import AliasIndex
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client['tubalub']
+
+    monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    monkeypatch.setattr(
+        'persistence.mongo.user_mongo_client.users_collection', db['users'])
+
+    db['users'].insert_many([
+        {"_id": "1", "aliases": ["ALICE", "AL"], "games": {"GAME1": 1}},
+        {"_id": "2", "aliases": ["BOB"], "games": {"GAME1": 2}},
+        {"_id": "yo-counter", "count": 10},
+    ])
+    yield db
+
+
+@pytest.mark.asyncio
+async def test_lookup_served_from_index(mock_db):
+    index = AliasIndex(ttl_seconds=60)
+    index.load()
+    mock_db['users'].delete_many({})
+
+    assert (await index.find_user_by_alias("AL"))['_id'] == "1"
+    assert (await index.get_user("2"))['aliases'] == ["BOB"]
+    assert index.stats() == {"size": 2, "hits": 2, "misses": 0, "hit_ratio": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_lookup_loads_lazily(mock_db):
+    index = AliasIndex(ttl_seconds=60)
+
+    assert (await index.find_user_by_alias("BOB"))['_id'] == "2"
+    assert index.generation == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_falls_back_to_mongo(mock_db):
+    index = AliasIndex(ttl_seconds=60)
+    index.load()
+    mock_db['users'].insert_one({"_id": "3", "aliases": ["CAROL"], "games": {}})
+
+    assert (await index.find_user_by_alias("CAROL"))['_id'] == "3"
+    assert (await index.find_user_by_alias("CAROL"))['_id'] == "3"
+    assert index.misses == 1
+    assert index.hits == 1
+
+    with pytest.raises(EntityNotFoundError):
+        await index.find_user_by_alias("DAVE")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_reloads(mock_db):
+    index = AliasIndex(ttl_seconds=60)
+    index.load()
+    mock_db['users'].update_one({"_id": "1"}, {"$set": {"games": {"GAME1": 5}}})
+
+    index.invalidate()
+
+    assert (await index.find_user_by_alias("ALICE"))['games'] == {"GAME1": 5}
+    assert index.generation == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_index_reloads(mock_db):
+    index = AliasIndex(ttl_seconds=0)
+    index.load()
+
+    await index.find_user_by_alias("ALICE")
+
+    assert index.generation == 2
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_invalidate_is_not_fresh(mock_db, monkeypatch):
+    index = AliasIndex(ttl_seconds=60)
+    find_users_with_aliases = user_mongo_client.find_users_with_aliases
+
+    def find_then_write():
+        # The users are read, then a sheet sync writes and invalidates before the load finishes
+        users = list(find_users_with_aliases())
+        mock_db['users'].update_one({"_id": "1"}, {"$set": {"games": {"GAME1": 5}}})
+        index.invalidate()
+        return users
+
+    with monkeypatch.context() as patched:
+        patched.setattr(user_mongo_client, 'find_users_with_aliases', find_then_write)
+        index.load()
+
+    assert not index.is_fresh()
+    assert (await index.find_user_by_alias("ALICE"))['games'] == {"GAME1": 5}
+    assert index.is_fresh()
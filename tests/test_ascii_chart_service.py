@@ -1,6 +1,11 @@
 # test_ascii_chart_service.py
+import io
+import random
 import unittest
-from service.ascii_chart_service import format_table, adjust_spacing
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+
+from service.ascii_chart_service import format_table, render_bars
 
 
 class TestAsciiChartService(unittest.TestCase):
@@ -33,17 +38,31 @@ class TestAsciiChartService(unittest.TestCase):
         self.assertIn('user1', result)
         self.assertIn('user2', result)
 
-    def test_adjust_spacing(self):
-        input_data = [('user1', 200), ('user2', 100), ('user3', 50)]
-        expected_output = [('user1', 200), ('user2', 100), ('user3', 50)]
-        result = adjust_spacing(input_data)
-        self.assertEqual(result, expected_output)
-
-    def test_adjust_spacing_with_different_lengths(self):
-        input_data = [('u1', 200), ('user2', 100), ('u3', 50)]
-        expected_output = [('u1   ', 200), ('user2', 100), ('u3   ', 50)]
-        result = adjust_spacing(input_data)
-        self.assertEqual(result, expected_output)
+    def test_render_bars_matches_asciibars(self):
+        asciibars = __import__('asciibars')
+        rng = random.Random(0)
+        for _ in range(200):
+            data = [(f"user{i}" * rng.randint(1, 3), rng.randint(-50, 500))
+                    for i in range(rng.randint(1, 10))]
+            if not any(count for _, count in data):
+                continue
+            for options in ({}, {'sep_lc': '|', 'unit': '▓', 'max_length': 40}):
+                printed = io.StringIO()
+                with redirect_stdout(printed):
+                    asciibars.plot(data, **options)
+                self.assertEqual(printed.getvalue(), render_bars(data, **options))
+
+    def test_render_bars_all_zero(self):
+        self.assertEqual("a  | 0 ▏\nbb | 0 ▏\n", render_bars([("a", 0), ("bb", 0)]))
+
+    def test_format_table_is_thread_safe(self):
+        data = [{'display_name': f'user{i}', 'yo_count': i * 10} for i in range(1, 6)]
+        expected = format_table(data)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: format_table(data), range(200)))
+
+        self.assertTrue(all(result == expected for result in results))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,37 @@
+import io
+import random
+import sys
+
+import pytest
+
+from service.ascii_chart_service import render_bars
+
+pytest.importorskip("pytest_benchmark")
+asciibars = pytest.importorskip("asciibars")
+
+CHART_OPTIONS = {'sep_lc': '|', 'unit': '▓', 'max_length': 40}
+
+
+@pytest.fixture(scope="module", params=[5, 20, 200])
+def data(request) -> list[tuple[str, int]]:
+    rng = random.Random(request.param)
+    return [(f"user{i}", rng.randint(0, 5000)) for i in range(request.param)]
+
+
+def _plot_with_stdout_swap(data: list[tuple[str, int]]) -> str:
+    # The rendering path format_table used before render_bars
+    old_stdout = sys.stdout
+    try:
+        sys.stdout = io.StringIO()
+        asciibars.plot(data, **CHART_OPTIONS)
+        return sys.stdout.getvalue()
+    finally:
+        sys.stdout = old_stdout
+
+
+def test_benchmark_render_bars(benchmark, data):
+    assert benchmark(render_bars, data, **CHART_OPTIONS) == _plot_with_stdout_swap(data)
+
+
+def test_benchmark_asciibars_stdout_swap(benchmark, data):
+    benchmark(_plot_with_stdout_swap, data)
@@ -0,0 +1,52 @@
+# test_async_user_mongo_client.py
+import mongomock
+import pytest
+
+from domain.User import User
+from persistence.EntityNotFoundError import EntityNotFoundError
+from persistence.mongo.async_user_mongo_client import (
+    create_user,
+    find_user_by_alias,
+    update_yo_count)
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client['tubalub']
+
+    monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    monkeypatch.setattr(
+        'persistence.mongo.user_mongo_client.users_collection', db['users'])
+
+    yield db
+
+
+@pytest.mark.asyncio
+async def test_find_user_by_alias(mock_db):
+    await create_user(User(id="123", aliases=["ALIAS1"], games={}))
+
+    found_user = await find_user_by_alias("ALIAS1")
+
+    assert found_user['_id'] == "123"
+
+
+@pytest.mark.asyncio
+async def test_find_user_by_alias_not_found(mock_db):
+    with pytest.raises(EntityNotFoundError):
+        await find_user_by_alias("MISSING")
+
+
+@pytest.mark.asyncio
+async def test_update_yo_count(mock_db):
+    class MockAuthor:
+        id = "123"
+        display_name = "TestUser"
+
+    mock_db['users'].insert_one({"_id": "yo-counter", "count": 0})
+
+    user_count, counter = await update_yo_count(MockAuthor())
+
+    assert user_count == 1
+    assert counter['count'] == 1
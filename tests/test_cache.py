@@ -0,0 +1,49 @@
+# test_cache.py
+from unittest.mock import patch
+
+from utils.cache import LRUCache
+
+
+def test_get_and_put():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", 2) == 2
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2, "hit_ratio": 1 / 3}
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+@patch('utils.cache.time')
+def test_entries_expire(mock_time):
+    mock_time.monotonic.return_value = 100
+    cache = LRUCache(maxsize=2, ttl_seconds=10)
+    cache.put("a", 1)
+
+    mock_time.monotonic.return_value = 110
+    assert cache.get("a") == 1
+
+    mock_time.monotonic.return_value = 111
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.clear()
+
+    assert cache.get("a") is None
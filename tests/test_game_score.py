@@ -34,3 +34,11 @@ def test_excluded_users(users):
     game_score = GameScore(name="game1", users=users)
     assert len(game_score.excluded_users) == 1
     assert game_score.excluded_users[0].id == "4"
+
+
+def test_users_without_score_are_ignored(users):
+    users.append(User(id="5", aliases=["user5"], games={}))
+    game_score = GameScore(name="game1", users=users)
+    assert game_score.score == 350
+    assert len(game_score.favored_users) == 3
+    assert len(game_score.excluded_users) == 1
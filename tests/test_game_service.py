@@ -0,0 +1,170 @@
+# test_game_service.py
+import mongomock
+import pytest
+
+import service.game_service
+from domain.User import User
+from persistence.mongo.user_mongo_client import to_user
+from service.alias_index import AliasIndex
+from service.game_service import get_recommendation, get_top_games, update_scores
+from utils.cache import LRUCache
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client['tubalub']
+    users_collection = db['users']
+
+    monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    monkeypatch.setattr(
+        'persistence.mongo.user_mongo_client.users_collection', users_collection)
+    monkeypatch.setattr(
+        'persistence.mongo.sheet_fingerprint_mongo_client.fingerprint_collection',
+        db['sheet_fingerprints'])
+
+    yield db
+
+
+def test_update_scores_resolves_aliases_in_bulk(mock_db):
+    mock_db['users'].insert_many([
+        {"_id": "1", "aliases": ["ALICE"], "games": {"GAME1": 1}},
+        {"_id": "2", "aliases": ["BOB", "BOBBY"], "games": {"GAME1": 2}},
+    ])
+
+    report = update_scores({
+        "Alice": {"GAME1": 5},
+        "bobby": {"GAME1": 2},
+        "Carol": {"GAME1": 3},
+    })
+
+    assert report.written == 2
+    assert report.matched == 2
+    assert report.modified == 1
+    assert report.unknown_aliases == ["Carol"]
+    assert mock_db['users'].find_one({"_id": "1"})['games'] == {"GAME1": 5}
+    assert mock_db['users'].find_one({"_id": "2"})['games'] == {"GAME1": 2}
+    assert mock_db['users'].count_documents({}) == 2
+
+
+def test_update_scores_empty(mock_db):
+    report = update_scores({})
+    assert report.matched == 0
+    assert report.unknown_aliases == []
+
+
+def test_update_scores_skips_unchanged_rows(mock_db):
+    mock_db['users'].insert_many([
+        {"_id": "1", "aliases": ["ALICE"], "games": {}},
+        {"_id": "2", "aliases": ["BOB"], "games": {}},
+    ])
+    update_scores({"Alice": {"GAME1": 5}, "Bob": {"GAME1": 2}})
+
+    report = update_scores({"Alice": {"GAME1": 5}, "Bob": {"GAME1": 3}})
+
+    assert report.skipped == 1
+    assert report.written == 1
+    assert mock_db['users'].find_one({"_id": "2"})['games'] == {"GAME1": 3}
+
+
+def test_update_scores_unchanged_sheet_is_noop(mock_db, monkeypatch):
+    mock_db['users'].insert_one({"_id": "1", "aliases": ["ALICE"], "games": {}})
+    scores = {"Alice": {"GAME1": 5}}
+    update_scores(scores)
+
+    def fail(*args):
+        raise AssertionError("unexpected database write")
+    monkeypatch.setattr(
+        'persistence.mongo.user_mongo_client.bulk_add_games', fail)
+
+    report = update_scores(scores)
+
+    assert report.skipped == 1
+    assert report.written == 0
+
+
+def test_update_scores_retries_unknown_aliases(mock_db):
+    scores = {"Alice": {"GAME1": 5}}
+    assert update_scores(scores).unknown_aliases == ["Alice"]
+
+    mock_db['users'].insert_one({"_id": "1", "aliases": ["ALICE"], "games": {}})
+    report = update_scores(scores)
+
+    assert report.written == 1
+    assert mock_db['users'].find_one({"_id": "1"})['games'] == {"GAME1": 5}
+
+
+def test_update_scores_force(mock_db):
+    mock_db['users'].insert_one({"_id": "1", "aliases": ["ALICE"], "games": {}})
+    scores = {"Alice": {"GAME1": 5}}
+    update_scores(scores)
+
+    report = update_scores(scores, force=True)
+
+    assert report.written == 1
+    assert report.skipped == 0
+
+
+def test_get_top_games_includes_games_missing_from_first_user():
+    users = [
+        User(id="1", aliases=["user1"], games={"game1": 1}),
+        User(id="2", aliases=["user2"], games={"game1": 2, "game2": 5}),
+    ]
+
+    games = get_top_games(users, 5)
+
+    assert [(game.name, game.score) for game in games] == [("game2", 5), ("game1", 3)]
+    assert games[0].excluded_users == []
+
+
+def test_get_top_games_limits_results():
+    users = [
+        User(id="1", aliases=["user1"], games={"game1": 1, "game2": 3, "game3": 2}),
+        User(id="2", aliases=["user2"], games={"game1": 1, "game2": 0, "game3": 2}),
+    ]
+
+    games = get_top_games(users, 2)
+
+    assert [game.name for game in games] == ["game3", "game2"]
+
+
+def test_get_top_games_empty():
+    assert get_top_games([], 5) == []
+
+
+@pytest.fixture
+def index(mock_db, monkeypatch):
+    index = AliasIndex(ttl_seconds=60)
+    monkeypatch.setattr('service.game_service.alias_index', index)
+    monkeypatch.setattr('service.game_service._recommendation_cache', LRUCache(8))
+    mock_db['users'].insert_many([
+        {"_id": "1", "aliases": ["USER1"], "games": {"GAME1": 1, "GAME2": 0}},
+        {"_id": "2", "aliases": ["USER2"], "games": {"GAME1": 2, "GAME2": 4}},
+    ])
+    index.load()
+    yield index
+
+
+def test_get_recommendation_is_cached_per_user_set(index):
+    users = [to_user(user) for user in index.users()]
+
+    first = get_recommendation(users, 5)
+    second = get_recommendation(list(reversed(users)), 5)
+
+    assert first == second
+    assert "GAME2" in first
+    assert service.game_service._recommendation_cache.hits == 1
+    assert get_recommendation(users, 1) != first
+
+
+def test_get_recommendation_invalidated_by_reload(index, mock_db):
+    users = [to_user(user) for user in index.users()]
+    first = get_recommendation(users, 5)
+
+    mock_db['users'].update_one({"_id": "1"}, {"$set": {"games": {"GAME3": 9}}})
+    index.load()
+    users = [to_user(user) for user in index.users()]
+
+    assert get_recommendation(users, 5) != first
+    assert service.game_service._recommendation_cache.hits == 0
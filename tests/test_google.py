@@ -0,0 +1,56 @@
+# test_google.py
+import json
+import time
+from unittest.mock import MagicMock
+
+import httplib2
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from service import google
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """No cached Sheets client and no network: any HTTP request fails the test."""
+    monkeypatch.setattr(google, 'SHEETS', None)
+    monkeypatch.setattr(google, 'get_credentials', lambda: AnonymousCredentials())
+    request = MagicMock(side_effect=AssertionError("unexpected HTTP request"))
+    # a plain function, so the mock sees which Http object sent each request
+    monkeypatch.setattr(httplib2.Http, 'request', lambda self, *args, **kwargs: request(self, *args, **kwargs))
+    return request
+
+
+def test_sheets_client_builds_offline(offline):
+    start = time.perf_counter()
+    sheets = google.get_sheets()
+
+    assert time.perf_counter() - start < 1
+    assert google.get_sheets() is sheets
+    offline.assert_not_called()
+
+
+def test_sheet_requests_share_one_connection(offline):
+    response = httplib2.Response({'status': 200})
+    offline.side_effect = None
+    offline.return_value = (response, json.dumps({'valueRanges': [{'values': [["a"]]}, {}]}).encode())
+
+    first = google._batch_get_google_sheet_data("sheet", ["A", "B"])
+    second = google._batch_get_google_sheet_data("sheet", ["A", "B"])
+
+    assert first == second == [[["a"]], []]
+    http_objects = {id(call.args[0]) for call in offline.call_args_list}
+    assert offline.call_count == 2
+    assert len(http_objects) == 1
+
+
+def test_sheets_client_fetches_missing_discovery_document(offline, monkeypatch):
+    from googleapiclient import discovery_cache
+    document = discovery_cache.get_static_doc(*google.SHEETS_API)
+    monkeypatch.setattr(discovery_cache, 'get_static_doc', lambda *args: None)
+    offline.side_effect = None
+    offline.return_value = (httplib2.Response({'status': 200}), document.encode())
+
+    assert google.get_sheets() is not None
+    assert offline.call_count == 1
+    assert "sheets" in offline.call_args.args[1]
@@ -0,0 +1,157 @@
+# test_indexes.py
+import os
+import uuid
+
+import mongomock
+import pymongo
+import pytest
+
+from persistence.mongo import sheet_fingerprint_mongo_client, user_mongo_client, wordle_mongo_client
+from persistence.mongo.indexes import INDEXES, ensure_indexes
+
+# Query plans need a real server, e.g. MONGO_TEST_URI=mongodb://localhost:27017
+MONGO_TEST_URI = os.getenv("MONGO_TEST_URI")
+
+# name -> (client module, its collection attribute, a call issuing the hot query)
+HOT_QUERIES = {
+    'find_user_by_alias': (user_mongo_client, 'users_collection',
+                           lambda: user_mongo_client.find_user_by_alias("U1")),
+    'find_users_by_aliases': (user_mongo_client, 'users_collection',
+                              lambda: user_mongo_client.find_users_by_aliases(["U1", "U2"])),
+    'find_users_by_yo_count': (user_mongo_client, 'users_collection',
+                               lambda: user_mongo_client.find_users_by_yo_count(10)),
+    'get_top_avg_scores': (wordle_mongo_client, 'wordle_collection',
+                           lambda: wordle_mongo_client.get_top_avg_scores(10, 10)),
+    'get_top_winners': (wordle_mongo_client, 'wordle_collection',
+                        lambda: wordle_mongo_client.get_top_winners(10)),
+    'rebuild_totals': (wordle_mongo_client, 'ledger_collection',
+                       lambda: wordle_mongo_client.rebuild_totals(["U1"])),
+    'get_fingerprints': (sheet_fingerprint_mongo_client, 'fingerprint_collection',
+                         lambda: sheet_fingerprint_mongo_client.get_fingerprints("r1")),
+}
+
+
+class RecordingCollection:
+    """Passes calls through to a collection, keeping the cursors and pipelines of its reads."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.cursors = []
+        self.pipelines = []
+
+    def find(self, *args, **kwargs):
+        cursor = self.collection.find(*args, **kwargs)
+        self.cursors.append(cursor)
+        return cursor
+
+    def find_one(self, filter=None, *args, **kwargs):
+        return next(self.find(filter, *args, **kwargs).limit(-1), None)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        self.pipelines.append(pipeline)
+        return self.collection.aggregate(pipeline, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+def _seed(db):
+    # a few documents, so the planner has something to choose between
+    db['users'].insert_many([{"aliases": [f"U{i}"], "yo_count": i} for i in range(20)])
+    db['wordle'].insert_many(
+        [{'_id': f"U{i}", 'average_score': i / 3, 'play_count': i, 'win_count': i % 4} for i in range(20)])
+    db['wordle_ledger'].insert_many(
+        [{'_id': i, 'results': [{'name': f"U{i}", 'score': 3, 'win': True}]} for i in range(20)])
+    db['sheet_fingerprints'].insert_many([{"range": f"r{i % 3}", "key": str(i), "hash": "h"} for i in range(20)])
+
+
+def _record(monkeypatch, db, name) -> RecordingCollection:
+    """Run a hot query through the real client code and return what it read."""
+    module, attribute, query = HOT_QUERIES[name]
+    recording = RecordingCollection(db[getattr(module, attribute).name])
+    monkeypatch.setattr(module, attribute, recording)
+    query()
+    return recording
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    db = mongomock.MongoClient()['tubalub']
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    return db
+
+
+@pytest.fixture
+def live_db(monkeypatch):
+    if not MONGO_TEST_URI:
+        pytest.skip("MONGO_TEST_URI is not set")
+    client = pymongo.MongoClient(MONGO_TEST_URI)
+    db_name = f"tub_bot_index_test_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    yield db
+    client.drop_database(db_name)
+    client.close()
+
+
+def _index_keys(collection) -> list:
+    return [list(index['key']) for index in collection.index_information().values()]
+
+
+def _stages(plan) -> set[str]:
+    """All stage names of the winning plans in explain() output."""
+    stages = set()
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.add(plan['stage'])
+        for key, value in plan.items():
+            if key != 'rejectedPlans':
+                stages |= _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            stages |= _stages(value)
+    return stages
+
+
+def test_ensure_indexes_creates_every_index(mock_db):
+    ensure_indexes()
+
+    for collection_name, indexes in INDEXES.items():
+        keys = _index_keys(mock_db[collection_name])
+        for index in indexes:
+            assert list(index.document['key'].items()) in keys
+
+
+def test_ensure_indexes_is_idempotent(mock_db):
+    ensure_indexes()
+    before = {name: mock_db[name].index_information() for name in INDEXES}
+
+    ensure_indexes()
+
+    assert {name: mock_db[name].index_information() for name in INDEXES} == before
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_are_recorded(mock_db, monkeypatch, name):
+    _seed(mock_db)
+
+    recording = _record(monkeypatch, mock_db, name)
+
+    assert len(recording.cursors) + len(recording.pipelines) == 1
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_an_index(live_db, monkeypatch, name):
+    ensure_indexes()
+    _seed(live_db)
+
+    recording = _record(monkeypatch, live_db, name)
+
+    if recording.cursors:
+        explain = recording.cursors[0].explain()
+    else:
+        explain = live_db.command(
+            'aggregate', recording.collection.name, pipeline=recording.pipelines[0], explain=True)
+    stages = _stages(explain)
+    assert 'COLLSCAN' not in stages
+    assert 'IXSCAN' in stages
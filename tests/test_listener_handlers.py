@@ -1,11 +1,21 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime
-from hikari import GuildMessageCreateEvent, Message, User
+from hikari import GuildMessageCreateEvent, Message, Snowflake, User
 
+from domain.Wordle import WordleUser
+from service.user_id_cache import UsernameCache
 from service.hikari.listener_handlers import handle_yo_message, handle_wordle_result
 
 
+@pytest.fixture(autouse=True)
+def username_cache(monkeypatch):
+    cache = UsernameCache(maxsize=100)
+    monkeypatch.setattr(cache, 'flush', AsyncMock())
+    monkeypatch.setattr('service.username_resolver.username_cache', cache)
+    return cache
+
+
 @pytest.fixture
 def mock_event():
     """Factory to create mock GuildMessageCreateEvent."""
@@ -23,28 +33,35 @@ def mock_event():
     return _create_event
 
 
+@pytest.fixture
+def yo_counter(monkeypatch):
+    counter = MagicMock()
+    counter.increment = AsyncMock()
+    counter.get_user_count = AsyncMock()
+    monkeypatch.setattr('service.hikari.listener_handlers.yo_counter', counter)
+    return counter
+
+
 @pytest.mark.asyncio
-@patch('service.hikari.listener_handlers.update_yo_count')
-async def test_handle_yo_message_no_milestone(mock_update, mock_event):
+async def test_handle_yo_message_no_milestone(yo_counter, mock_event):
     """Test yo message handling when not at milestone."""
     event = mock_event(123, "TestUser")
-    mock_update.return_value = (
-        5, {'count': 99, 'threshold': 100, 'start_date': 1609459200})
+    yo_counter.increment.return_value = {'count': 99, 'threshold': 100, 'start_date': 1609459200}
 
     await handle_yo_message(event)
 
-    mock_update.assert_called_once_with(event.message.author)
+    yo_counter.increment.assert_awaited_once_with(event.message.author)
+    yo_counter.get_user_count.assert_not_called()
     event.message.respond.assert_not_called()
 
 
 @pytest.mark.asyncio
-@patch('service.hikari.listener_handlers.update_yo_count')
 @patch('service.hikari.listener_handlers.datetime')
-async def test_handle_yo_message_at_milestone(mock_datetime, mock_update, mock_event):
+async def test_handle_yo_message_at_milestone(mock_datetime, yo_counter, mock_event):
     """Test yo message handling at milestone threshold."""
     event = mock_event(123, "TestUser")
-    mock_update.return_value = (
-        10, {'count': 100, 'threshold': 100, 'start_date': 1609459200})
+    yo_counter.increment.return_value = {'count': 100, 'threshold': 100, 'start_date': 1609459200}
+    yo_counter.get_user_count.return_value = 10
     mock_datetime.fromtimestamp.return_value = datetime(2021, 1, 1)
     mock_datetime.now.return_value = datetime(2021, 1, 11)
 
@@ -59,93 +76,113 @@ async def test_handle_yo_message_at_milestone(mock_datetime, mock_update, mock_e
 
 
 @pytest.mark.asyncio
+@patch('service.hikari.listener_handlers.rebuild_totals', new_callable=AsyncMock)
 @patch('service.hikari.listener_handlers.parse_wordle_message')
-@patch('service.hikari.listener_handlers.update_wordle_entry')
-async def test_handle_wordle_result_simple(mock_update_entry, mock_parse, mock_event):
+@patch('service.hikari.listener_handlers.record_results', new_callable=AsyncMock, return_value=True)
+async def test_handle_wordle_result_simple(mock_record, mock_parse, mock_rebuild, mock_event):
     """Test wordle result handling with simple username."""
     event = mock_event(123, "TestUser")
     rest = MagicMock()
 
-    mock_user = MagicMock()
-    mock_user.name = "Alice"
-    mock_user.score_sum = 3
-    mock_user.win_count = 1
-    mock_parse.return_value = {"Alice": mock_user}
+    mock_parse.return_value = {"Alice": WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)}
 
     await handle_wordle_result(rest, event)
 
-    mock_parse.assert_called_once_with(rest, {}, event.message)
-    mock_update_entry.assert_called_once_with("Alice", 3, True)
+    mock_parse.assert_called_once_with(rest, {}, event.message, set())
+    mock_record.assert_awaited_once_with(
+        event.message.id, [WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)])
+    mock_rebuild.assert_awaited_once_with(["Alice"])
+
+
+def discord_user(user_id: int, display_name: str):
+    user = MagicMock(spec=User)
+    user.id = Snowflake(user_id)
+    user.display_name = display_name
+    return user
 
 
 @pytest.mark.asyncio
-@patch('service.hikari.listener_handlers.parse_wordle_message')
-@patch('service.hikari.listener_handlers.update_wordle_entry')
-async def test_handle_wordle_result_snowflake_id(mock_update_entry, mock_parse, mock_event):
-    """Test wordle result handling with snowflake ID resolution."""
+@patch('service.hikari.listener_handlers.rebuild_totals', new_callable=AsyncMock)
+@patch('service.hikari.listener_handlers.record_results', new_callable=AsyncMock, return_value=True)
+async def test_handle_wordle_result_uses_message_mentions(mock_record, mock_rebuild, mock_event):
+    """Test that mentioned users are named from the message without fetching them."""
     event = mock_event(123, "TestUser")
+    event.message.content = "Here are yesterday's results:\n4/6: <@123456789>"
+    event.message.user_mentions = {Snowflake(123456789): discord_user(123456789, "ResolvedUser")}
     rest = MagicMock()
-
-    mock_user = MagicMock()
-    mock_user.name = "123456789"
-    mock_user.score_sum = 4
-    mock_user.win_count = 0
-    mock_parse.return_value = {"123456789": mock_user}
-
-    mock_discord_user = MagicMock()
-    mock_discord_user.display_name = "ResolvedUser"
-    event.app.rest.fetch_user.return_value = mock_discord_user
+    rest.fetch_user = AsyncMock()
 
     await handle_wordle_result(rest, event)
 
-    event.app.rest.fetch_user.assert_called_once_with(123456789)
-    mock_update_entry.assert_called_once_with("ResolvedUser", 4, False)
+    rest.fetch_user.assert_not_called()
+    mock_record.assert_awaited_once_with(
+        event.message.id, [WordleUser(name="ResolvedUser", win_count=1, play_count=1, score_sum=4)])
 
 
 @pytest.mark.asyncio
-@patch('service.hikari.listener_handlers.parse_wordle_message')
-@patch('service.hikari.listener_handlers.update_wordle_entry')
-async def test_handle_wordle_result_fetch_user_fails(mock_update_entry, mock_parse, mock_event):
-    """Test wordle result handling when user fetch fails."""
+@patch('service.hikari.listener_handlers.rebuild_totals', new_callable=AsyncMock)
+@patch('service.hikari.listener_handlers.record_results', new_callable=AsyncMock, return_value=True)
+async def test_handle_wordle_result_fetches_unknown_mentions(mock_record, mock_rebuild, mock_event):
+    """Test that users missing from the mentions and caches are fetched, and a result with a failed lookup isn't recorded."""
     event = mock_event(123, "TestUser")
+    event.message.content = "Here are yesterday's results:\n4/6: <@123456789>\nX/6: <@999999999>"
+    event.message.user_mentions = {}
     rest = MagicMock()
 
-    mock_user = MagicMock()
-    mock_user.name = "999999999"
-    mock_user.score_sum = 5
-    mock_user.win_count = 1
-    mock_parse.return_value = {"999999999": mock_user}
+    async def fetch_user(snowflake):
+        if snowflake == 999999999:
+            raise Exception("User not found")
+        return discord_user(snowflake, "FetchedUser")
+    rest.fetch_user = AsyncMock(side_effect=fetch_user)
 
-    event.app.rest.fetch_user.side_effect = Exception("User not found")
+    await handle_wordle_result(rest, event)
+
+    assert rest.fetch_user.await_count == 2
+    # recording it without the failed lookup would lose that player's day, the next backfill retries it
+    mock_record.assert_not_awaited()
+    mock_rebuild.assert_not_awaited()
 
+    rest.fetch_user = AsyncMock(side_effect=lambda snowflake: discord_user(snowflake, f"User{snowflake}"))
     await handle_wordle_result(rest, event)
 
-    event.app.rest.fetch_user.assert_called_once_with(999999999)
-    mock_update_entry.assert_not_called()
+    users = mock_record.await_args.args[1]
+    # the resolved user was cached by the first attempt
+    assert sorted(user.name for user in users) == ["FetchedUser", "User999999999"]
 
 
 @pytest.mark.asyncio
+@patch('service.hikari.listener_handlers.rebuild_totals', new_callable=AsyncMock)
 @patch('service.hikari.listener_handlers.parse_wordle_message')
-@patch('service.hikari.listener_handlers.update_wordle_entry')
-async def test_handle_wordle_result_multiple_users(mock_update_entry, mock_parse, mock_event):
+@patch('service.hikari.listener_handlers.record_results', new_callable=AsyncMock, return_value=True)
+async def test_handle_wordle_result_multiple_users(mock_record, mock_parse, mock_rebuild, mock_event):
     """Test wordle result handling with multiple users."""
     event = mock_event(123, "TestUser")
     rest = MagicMock()
 
-    mock_user1 = MagicMock()
-    mock_user1.name = "Alice"
-    mock_user1.score_sum = 3
-    mock_user1.win_count = 1
+    mock_parse.return_value = {
+        "Alice": WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3),
+        "Bob": WordleUser(name="Bob", win_count=0, play_count=1, score_sum=7),
+    }
 
-    mock_user2 = MagicMock()
-    mock_user2.name = "Bob"
-    mock_user2.score_sum = 7
-    mock_user2.win_count = 0
+    await handle_wordle_result(rest, event)
 
-    mock_parse.return_value = {"Alice": mock_user1, "Bob": mock_user2}
+    users = mock_record.await_args.args[1]
+    assert [(user.name, user.score_sum, user.win_count) for user in users] == [
+        ("Alice", 3, 1), ("Bob", 7, 0)]
+    mock_rebuild.assert_awaited_once_with(["Alice", "Bob"])
 
-    await handle_wordle_result(rest, event)
 
-    assert mock_update_entry.call_count == 2
-    mock_update_entry.assert_any_call("Alice", 3, True)
-    mock_update_entry.assert_any_call("Bob", 7, False)
+@pytest.mark.asyncio
+@patch('service.hikari.listener_handlers.rebuild_totals', new_callable=AsyncMock)
+@patch('service.hikari.listener_handlers.parse_wordle_message')
+@patch('service.hikari.listener_handlers.record_results', new_callable=AsyncMock, return_value=False)
+async def test_handle_wordle_result_already_recorded(mock_record, mock_parse, mock_rebuild, mock_event):
+    """Test that a result message already in the ledger doesn't change the totals."""
+    event = mock_event(123, "TestUser")
+
+    mock_parse.return_value = {"Alice": WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)}
+
+    await handle_wordle_result(MagicMock(), event)
+
+    mock_record.assert_awaited_once()
+    mock_rebuild.assert_not_called()
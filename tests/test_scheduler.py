@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from service.scheduler import ScheduledJob, Scheduler
+
+
+def job(run, interval_seconds=0.01, jitter=0.0, max_backoff_seconds=0.08):
+    return ScheduledJob("test", run, interval_seconds, jitter, max_backoff_seconds)
+
+
+def test_jitter_stays_within_bounds():
+    scheduled = job(AsyncMock(), interval_seconds=100, jitter=0.1)
+
+    delays = [scheduled.next_delay() for _ in range(200)]
+
+    assert all(90 <= delay <= 110 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_failures_back_off_up_to_the_limit():
+    scheduled = job(AsyncMock(), interval_seconds=10, max_backoff_seconds=60)
+
+    delays = []
+    for failures in range(5):
+        scheduled.stats.consecutive_failures = failures
+        delays.append(scheduled.next_delay())
+
+    assert delays == [10, 20, 40, 60, 60]
+
+
+@pytest.mark.asyncio
+async def test_run_once_records_stats():
+    async def run():
+        await asyncio.sleep(0.01)
+    scheduled = job(run)
+
+    await scheduled.run_once()
+
+    assert scheduled.stats.runs == 1
+    assert scheduled.stats.failures == 0
+    assert scheduled.stats.last_duration_seconds >= 0.01
+    assert scheduled.stats.last_started_at is not None
+    assert not scheduled.stats.running
+
+
+@pytest.mark.asyncio
+async def test_failure_is_recorded_and_success_resets_backoff():
+    run = AsyncMock(side_effect=[Exception("sheet unavailable"), Exception("again"), None])
+    scheduled = job(run)
+
+    await scheduled.run_once()
+    await scheduled.run_once()
+    assert scheduled.stats.consecutive_failures == 2
+    assert scheduled.stats.last_error == "again"
+
+    await scheduled.run_once()
+    assert scheduled.stats.runs == 3
+    assert scheduled.stats.failures == 2
+    assert scheduled.stats.consecutive_failures == 0
+    assert scheduled.stats.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_runs_never_overlap():
+    state = {'in_flight': 0, 'max_in_flight': 0, 'runs': 0}
+
+    async def run():
+        state['in_flight'] += 1
+        state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        # longer than the interval
+        await asyncio.sleep(0.03)
+        state['in_flight'] -= 1
+        state['runs'] += 1
+
+    scheduled = job(run)
+    scheduled.start()
+    await asyncio.sleep(0.15)
+    await scheduled.stop()
+
+    assert state['runs'] >= 2
+    assert state['max_in_flight'] == 1
+    assert scheduled.stats.next_run_at is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_skips_jobs_without_an_interval():
+    scheduler = Scheduler({'jitter': 0, 'jobs': {'sheet_sync': {'interval_seconds': 0.01},
+                                                  'wordle_reconcile': {'interval_seconds': 0}}})
+    sync = AsyncMock()
+
+    assert scheduler.add("sheet_sync", sync) is not None
+    assert scheduler.add("wordle_reconcile", AsyncMock()) is None
+    assert scheduler.add("unknown", AsyncMock()) is None
+
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert sync.await_count >= 1
+    stats = scheduler.stats()
+    assert list(stats) == ["sheet_sync"]
+    assert stats["sheet_sync"]["runs"] == sync.await_count
+    assert stats["sheet_sync"]["interval_seconds"] == 0.01
@@ -0,0 +1,28 @@
+# test_score_matrix.py
+from domain.ScoreMatrix import ScoreMatrix
+from domain.User import User
+
+
+def test_top_games_sums_selected_users():
+    matrix = ScoreMatrix([
+        User(id="1", aliases=["user1"], games={"game1": 3, "game2": 1}),
+        User(id="2", aliases=["user2"], games={"game1": 0, "game2": 4}),
+        User(id="3", aliases=["user3"], games={"game3": 9}),
+    ])
+
+    assert matrix.top_games(["1", "2"], 5) == [("game2", 5), ("game1", 3), ("game3", 0)]
+    assert matrix.top_games(["3"], 1) == [("game3", 9)]
+    assert "3" in matrix
+    assert "4" not in matrix
+
+
+def test_top_games_keeps_first_seen_order_on_ties():
+    matrix = ScoreMatrix([
+        User(id="1", aliases=["user1"], games={"game2": 1, "game1": 1}),
+    ])
+
+    assert matrix.top_games(["1"], 2) == [("game2", 1), ("game1", 1)]
+
+
+def test_top_games_without_users():
+    assert ScoreMatrix([]).top_games([], 5) == []
@@ -0,0 +1,116 @@
+import hikari
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from service.hikari.search import search_user_messages, stream_user_messages
+
+
+class FakeHistory:
+    """Stand-in for hikari's LazyIterator over a channel's history, optionally failing at the end."""
+
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+
+    def limit(self, limit):
+        return FakeHistory(self.messages[:limit], self.error)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for message in self.messages:
+            yield message
+        if self.error:
+            raise self.error
+
+
+def make_message(message_id: int, content: str):
+    message = MagicMock()
+    message.id = message_id
+    message.content = content
+    return message
+
+
+@pytest.fixture
+def channel():
+    channel = MagicMock(spec=hikari.channels.TextableChannel)
+    channel.fetch_history.return_value = FakeHistory(
+        [make_message(i, "wordle" if i % 2 else "chat") for i in range(1, 11)])
+    return channel
+
+
+@pytest.fixture
+def bot(channel):
+    bot = MagicMock()
+    bot.rest.fetch_channel = AsyncMock(return_value=channel)
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_matching_messages(bot):
+    ids = [m.id async for m in stream_user_messages(
+        bot, 1, lambda m: m.content == "wordle")]
+
+    assert ids == [1, 3, 5, 7, 9]
+
+
+@pytest.mark.asyncio
+async def test_stream_honors_limit(bot):
+    ids = [m.id async for m in stream_user_messages(bot, 1, lambda m: True, limit=4)]
+
+    assert ids == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_at_before_when_both_bounds_given(bot, channel):
+    ids = [m.id async for m in stream_user_messages(
+        bot, 1, lambda m: True, after=1, before=6)]
+
+    assert ids == [1, 2, 3, 4, 5]
+    assert channel.fetch_history.call_args.kwargs == {"after": 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_producer_when_consumer_breaks(bot):
+    async for message in stream_user_messages(bot, 1, lambda m: True):
+        break
+
+    # A second, complete read still works after an early exit
+    assert len(await search_user_messages(bot, 1, lambda m: True)) == 10
+
+
+@pytest.mark.asyncio
+async def test_search_returns_empty_for_non_text_channel(bot):
+    bot.rest.fetch_channel = AsyncMock(return_value=MagicMock())
+
+    assert await search_user_messages(bot, 1, lambda m: True) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_raises_fetch_errors_after_the_fetched_messages(bot, channel):
+    channel.fetch_history.return_value = FakeHistory(
+        [make_message(1, "wordle"), make_message(2, "wordle")], error=RuntimeError("rate limited"))
+    ids = []
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        async for message in stream_user_messages(bot, 1, lambda m: True):
+            ids.append(message.id)
+
+    assert ids == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stream_raises_when_the_channel_cannot_be_fetched(bot):
+    bot.rest.fetch_channel = AsyncMock(side_effect=RuntimeError("Discord is down"))
+
+    with pytest.raises(RuntimeError, match="Discord is down"):
+        [message async for message in stream_user_messages(bot, 1, lambda m: True)]
+
+
+@pytest.mark.asyncio
+async def test_search_returns_messages_found_before_an_error(bot, channel):
+    channel.fetch_history.return_value = FakeHistory(
+        [make_message(1, "wordle")], error=RuntimeError("rate limited"))
+
+    assert [m.id for m in await search_user_messages(bot, 1, lambda m: True)] == [1]
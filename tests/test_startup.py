@@ -0,0 +1,107 @@
+# test_startup.py
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import mongomock
+import pytest
+
+from persistence.mongo import mongo_client
+from service import google, startup
+
+
+@pytest.fixture
+def secrets(monkeypatch):
+    """Secret Manager stand-in taking 50ms per secret and tracking concurrency."""
+    monkeypatch.setattr(google, 'ENV', None)
+    monkeypatch.setattr(google, 'BOT_TOKEN', None)
+    monkeypatch.setattr(google, 'MONGO_TOKEN', None)
+    state = {'in_flight': 0, 'max_in_flight': 0}
+    lock = threading.Lock()
+
+    def get_secrets(secret_id, version_id="latest"):
+        with lock:
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        time.sleep(0.05)
+        with lock:
+            state['in_flight'] -= 1
+        return f"token-{secret_id}"
+
+    monkeypatch.setattr(google, 'get_secrets', get_secrets)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_fetch_tokens_concurrently(secrets):
+    bot_token, mongo_token = await google.fetch_tokens()
+
+    assert bot_token == f"token-{google.BOT_TOKEN_KEY}"
+    assert mongo_token == f"token-{google.MONGO_TOKEN_KEY}"
+    assert secrets['max_in_flight'] == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_tokens_reuses_fetched_tokens(secrets, monkeypatch):
+    monkeypatch.setattr(google, 'BOT_TOKEN', "bot")
+    monkeypatch.setattr(google, 'MONGO_TOKEN', "mongo")
+
+    assert await google.fetch_tokens() == ("bot", "mongo")
+    assert secrets['max_in_flight'] == 0
+
+
+def test_collections_connect_on_first_use(monkeypatch):
+    monkeypatch.setattr(mongo_client, 'db', None)
+
+    def fake_connect(token=None):
+        mongo_client.db = mongomock.MongoClient()['tubalub']
+        return mongo_client.db
+    connect = MagicMock(side_effect=fake_connect)
+    monkeypatch.setattr(mongo_client, 'connect', connect)
+
+    users = mongo_client.get_collection('users')
+    connect.assert_not_called()
+
+    users.insert_one({"_id": "1"})
+    assert users.find_one({"_id": "1"}) == {"_id": "1"}
+    connect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_start_records_phase_timings(secrets, monkeypatch):
+    connect = MagicMock()
+    monkeypatch.setattr(mongo_client, 'connect', connect)
+    for name in ('alias_index', 'username_cache', 'yo_leaderboard'):
+        monkeypatch.setattr(startup, name, MagicMock())
+    monkeypatch.setattr(startup, '_ensure_indexes', MagicMock(side_effect=Exception("not fatal")))
+    create_bot = MagicMock()
+    monkeypatch.setattr(startup.hikari_bot, 'create_bot', create_bot)
+    monkeypatch.setattr(startup.hikari_bot, 'start_bot', AsyncMock())
+    monkeypatch.setattr(startup, 'scheduler', MagicMock())
+
+    await startup.start()
+
+    connect.assert_called_once_with(f"token-{google.MONGO_TOKEN_KEY}")
+    create_bot.assert_called_once_with(f"token-{google.BOT_TOKEN_KEY}")
+    assert [call.args[0] for call in startup.scheduler.add.call_args_list] == ["sheet_sync", "wordle_reconcile"]
+    startup.scheduler.start.assert_called_once()
+    startup.yo_leaderboard.load.assert_called_once()
+    assert set(startup.startup_timings) == {
+        "secrets", "mongo", "alias_index", "username_cache", "yo_leaderboard", "indexes", "bot", "total"}
+    # both secrets were fetched at once
+    assert startup.startup_timings["secrets"] < 0.09
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_is_retried(monkeypatch):
+    import fast_api
+    start = AsyncMock(side_effect=[Exception("Secret Manager unavailable"), Exception("DNS failure"), None])
+    monkeypatch.setattr(startup, 'start', start)
+    monkeypatch.setitem(fast_api.config, 'startup', {'retry_seconds': 0.01, 'max_retry_seconds': 0.02})
+    sleep = AsyncMock()
+    monkeypatch.setattr(fast_api.asyncio, 'sleep', sleep)
+
+    await fast_api._start()
+
+    assert start.await_count == 3
+    assert [call.args[0] for call in sleep.await_args_list] == [0.01, 0.02]
@@ -0,0 +1,74 @@
+# test_user_id_cache.py
+import time
+
+import mongomock
+import pytest
+from hikari import Snowflake
+
+from service.user_id_cache import UsernameCache
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client['tubalub']
+
+    monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    monkeypatch.setattr(
+        'persistence.mongo.username_mongo_client.username_collection', db['usernames'])
+
+    yield db
+
+
+def test_warm_from_mongo(mock_db):
+    mock_db['usernames'].insert_many([{"_id": 1, "name": "Alice"}, {"_id": 2, "name": "Bob"}])
+    cache = UsernameCache(maxsize=10)
+
+    assert cache.warm() == 2
+    assert cache.get(Snowflake(1)) == "Alice"
+    assert cache[Snowflake(2)] == "Bob"
+    assert cache.get(Snowflake(3)) is None
+    assert cache.stats() == {"size": 2, "hits": 2, "misses": 1, "hit_ratio": 2 / 3}
+
+
+def test_warm_expires_names_from_when_they_were_resolved(mock_db):
+    now = time.time()
+    mock_db['usernames'].insert_many([
+        {"_id": 1, "name": "Fresh", "resolved_at": now - 10},
+        {"_id": 2, "name": "Aging", "resolved_at": now - 99.9},
+        {"_id": 3, "name": "Expired", "resolved_at": now - 200},
+        {"_id": 4, "name": "Unstamped"},
+    ])
+    cache = UsernameCache(maxsize=10, ttl_seconds=100)
+
+    assert cache.warm() == 2
+    assert cache.get(Snowflake(1)) == "Fresh"
+    assert Snowflake(3) not in cache
+    assert Snowflake(4) not in cache
+    time.sleep(0.2)
+    assert Snowflake(2) not in cache
+
+
+def test_bounded(mock_db):
+    cache = UsernameCache(maxsize=2)
+    cache[Snowflake(1)] = "Alice"
+    cache[Snowflake(2)] = "Bob"
+    cache[Snowflake(3)] = "Carol"
+
+    assert len(cache) == 2
+    assert Snowflake(1) not in cache
+
+
+@pytest.mark.asyncio
+async def test_new_names_written_back(mock_db):
+    cache = UsernameCache(maxsize=10)
+
+    cache[Snowflake(1)] = "Alice"
+    cache[Snowflake(2)] = "Bob"
+    await cache.flush()
+
+    alice = mock_db['usernames'].find_one({"_id": 1})
+    assert alice['name'] == "Alice"
+    assert time.time() - alice['resolved_at'] < 5
+    assert mock_db['usernames'].count_documents({}) == 2
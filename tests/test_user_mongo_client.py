@@ -9,6 +9,7 @@ from persistence.mongo.user_mongo_client import (
     update_user,
     delete_user,
     add_aliases,
+    bulk_add_aliases,
     remove_alias,
     add_game,
     update_yo_count,
@@ -118,3 +119,12 @@ def test_get_by_yo_count(mock_db):
     assert len(result) == 2
     assert result[0]['display_name'] == "User2"
     assert result[1]['display_name'] == "User1"
+
+
+def test_bulk_add_aliases(mock_db):
+    user = User(id="123", aliases=["ALIAS1"], games={"game1": 100})
+    create_user(user)
+    result = bulk_add_aliases({"123": ["alias1", "alias2"], "456": ["alias3"]})
+    assert result.upserted_count == 1
+    assert get_user("123")['aliases'] == ["ALIAS1", "ALIAS2"]
+    assert get_user("456")['aliases'] == ["ALIAS3"]
@@ -0,0 +1,142 @@
+# test_username_resolver.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from hikari import Snowflake, User
+
+from service.user_id_cache import UsernameCache
+from service.username_resolver import remember_users, resolve_usernames
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = UsernameCache(maxsize=100)
+    monkeypatch.setattr(cache, 'flush', AsyncMock())
+    monkeypatch.setattr('service.username_resolver.username_cache', cache)
+    # A semaphore belongs to one event loop, each test runs its own
+    monkeypatch.setattr('service.username_resolver._semaphore', None)
+    return cache
+
+
+@pytest.fixture
+def rest():
+    """REST client whose fetch_user tracks concurrency and call counts."""
+    rest = MagicMock()
+    rest.in_flight = 0
+    rest.max_in_flight = 0
+
+    async def fetch_user(snowflake):
+        rest.in_flight += 1
+        rest.max_in_flight = max(rest.max_in_flight, rest.in_flight)
+        await asyncio.sleep(0.01)
+        rest.in_flight -= 1
+        if snowflake == 404:
+            raise Exception("User not found")
+        user = MagicMock()
+        user.display_name = f"User{snowflake}"
+        return user
+
+    rest.fetch_user = MagicMock(side_effect=fetch_user)
+    return rest
+
+
+@pytest.mark.asyncio
+async def test_resolves_each_id_once(cache, rest):
+    names = await resolve_usernames(rest, [Snowflake(1), Snowflake(2), Snowflake(1)])
+
+    assert names == {Snowflake(1): "User1", Snowflake(2): "User2"}
+    assert rest.fetch_user.call_count == 2
+    assert cache.get(Snowflake(1)) == "User1"
+    cache.flush.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_uses_cache(cache, rest):
+    cache[Snowflake(1)] = "Cached"
+
+    names = await resolve_usernames(rest, [Snowflake(1)])
+
+    assert names == {Snowflake(1): "Cached"}
+    rest.fetch_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bounds_concurrency(cache, rest, monkeypatch):
+    monkeypatch.setattr('service.username_resolver.MAX_CONCURRENT_FETCHES', 3)
+
+    names = await resolve_usernames(rest, [Snowflake(i) for i in range(1, 11)])
+
+    assert len(names) == 10
+    assert rest.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_bound_is_shared_by_concurrent_callers(cache, rest, monkeypatch):
+    monkeypatch.setattr('service.username_resolver.MAX_CONCURRENT_FETCHES', 3)
+
+    first, second = await asyncio.gather(
+        resolve_usernames(rest, [Snowflake(i) for i in range(1, 6)]),
+        resolve_usernames(rest, [Snowflake(i) for i in range(6, 11)]))
+
+    assert len(first) == len(second) == 5
+    assert rest.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_shared_fetch_running(cache, rest):
+    first = asyncio.create_task(resolve_usernames(rest, [Snowflake(1)]))
+    second = asyncio.create_task(resolve_usernames(rest, [Snowflake(1)]))
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await second == {Snowflake(1): "User1"}
+    assert rest.fetch_user.call_count == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_coalesces_concurrent_callers(cache, rest):
+    first, second = await asyncio.gather(
+        resolve_usernames(rest, [Snowflake(1)]),
+        resolve_usernames(rest, [Snowflake(1)]))
+
+    assert first == second == {Snowflake(1): "User1"}
+    assert rest.fetch_user.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_lookup_is_missing(cache, rest):
+    names = await resolve_usernames(rest, [Snowflake(404), Snowflake(1)])
+
+    assert names == {Snowflake(1): "User1"}
+    assert Snowflake(404) not in cache
+
+
+@pytest.mark.asyncio
+async def test_remembered_users_are_not_fetched(cache, rest):
+    user = MagicMock()
+    user.id = Snowflake(1)
+    user.display_name = "Mentioned"
+    remember_users([user])
+
+    names = await resolve_usernames(rest, [Snowflake(1)])
+
+    assert names == {Snowflake(1): "Mentioned"}
+    rest.fetch_user.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_uses_member_cache(cache, rest):
+    member_cache = MagicMock()
+    cached_user = MagicMock(spec=User)
+    cached_user.display_name = "Member"
+    member_cache.get_user.side_effect = lambda snowflake: cached_user if snowflake == 1 else None
+
+    names = await resolve_usernames(rest, [Snowflake(1), Snowflake(2)], member_cache)
+
+    assert names == {Snowflake(1): "Member", Snowflake(2): "User2"}
+    rest.fetch_user.assert_called_once_with(Snowflake(2))
+    assert cache.get(Snowflake(1)) == "Member"
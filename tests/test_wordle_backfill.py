@@ -0,0 +1,108 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from domain.BackfillProgress import CANCELLED, DONE, FAILED, RUNNING
+from service import wordle_backfill as wordle_backfill_module
+from service.wordle_backfill import WordleBackfill
+
+
+@pytest.fixture
+def crawl(monkeypatch):
+    """Stand-in for initialize_wordle_messages that scans one message, then waits for release."""
+    state = {'release': asyncio.Event(), 'calls': [], 'error': None}
+
+    async def initialize_wordle_messages(bot, full_rebuild=False, progress=None):
+        state['calls'].append((bot, full_rebuild))
+        progress.scanned += 1
+        await state['release'].wait()
+        progress.parsed += 1
+        progress.recorded += 1
+        progress.users_updated += 1
+        progress.error = state['error']
+        return progress
+
+    monkeypatch.setattr(wordle_backfill_module, 'initialize_wordle_messages', initialize_wordle_messages)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_start_returns_before_the_crawl_finishes(crawl):
+    backfill = WordleBackfill()
+    bot = MagicMock()
+
+    assert backfill.start(bot, full_rebuild=True)
+    await asyncio.sleep(0)
+
+    assert backfill.is_running()
+    assert backfill.progress.state == RUNNING
+    assert backfill.progress.full_rebuild
+    assert backfill.progress.scanned == 1
+
+    crawl['release'].set()
+    progress = await backfill.wait()
+
+    assert crawl['calls'] == [(bot, True)]
+    assert progress.state == DONE
+    assert (progress.scanned, progress.parsed, progress.recorded, progress.users_updated) == (1, 1, 1, 1)
+    assert progress.finished_at >= progress.started_at
+
+
+@pytest.mark.asyncio
+async def test_only_one_crawl_runs_at_a_time(crawl):
+    backfill = WordleBackfill()
+
+    assert backfill.start(MagicMock())
+    assert not backfill.start(MagicMock())
+    crawl['release'].set()
+    await backfill.wait()
+    # a finished crawl can be started again
+    assert backfill.start(MagicMock())
+    await backfill.wait()
+
+    assert len(crawl['calls']) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_the_running_crawl(crawl):
+    backfill = WordleBackfill()
+    backfill.start(MagicMock())
+    await asyncio.sleep(0)
+
+    await backfill.cancel()
+
+    assert not backfill.is_running()
+    assert backfill.progress.state == CANCELLED
+    assert backfill.progress.scanned == 1
+    assert backfill.progress.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_crawl_keeps_its_error(crawl):
+    backfill = WordleBackfill()
+    crawl['error'] = "Discord is down"
+    crawl['release'].set()
+
+    backfill.start(MagicMock())
+    progress = await backfill.wait()
+
+    assert progress.state == FAILED
+    assert progress.error == "Discord is down"
+
+
+@pytest.mark.asyncio
+async def test_cancel_without_a_crawl_is_a_no_op():
+    await WordleBackfill().cancel()
+
+
+@pytest.mark.asyncio
+async def test_run_waits_for_the_crawl_and_raises_on_failure(crawl):
+    backfill = WordleBackfill()
+    crawl['release'].set()
+
+    assert (await backfill.run(MagicMock())).state == DONE
+
+    crawl['error'] = "Discord is down"
+    with pytest.raises(RuntimeError, match="Discord is down"):
+        await backfill.run(MagicMock())
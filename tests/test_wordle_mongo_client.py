@@ -1,11 +1,21 @@
 # test_wordle_mongo_client.py
+import itertools
+
 import mongomock
 import pytest
+from unittest.mock import MagicMock
+from pymongo.errors import BulkWriteError
 
+from domain.Wordle import WordleUser
 from persistence.mongo.wordle_mongo_client import (
-    update_wordle_entry,
+    record_results,
+    bulk_record_results,
+    rebuild_totals,
+    get_completed_through,
+    set_completed_through,
     get_top_avg_scores,
-    get_top_winners
+    get_top_winners,
+    backfill_leaderboard_fields
 )
 
 
@@ -21,13 +31,26 @@ def mock_db(monkeypatch):
     monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
     monkeypatch.setattr(
         'persistence.mongo.wordle_mongo_client.wordle_collection', wordle_collection)
+    monkeypatch.setattr(
+        'persistence.mongo.wordle_mongo_client.ledger_collection', db['wordle_ledger'])
+    monkeypatch.setattr(
+        'persistence.mongo.wordle_mongo_client.sync_collection', db['wordle_sync'])
 
     yield db
 
 
-def test_insert_wordle_entry(mock_db):
+_message_ids = itertools.count(1000)
+
+
+def record_game(name: str, score: int, win: bool):
+    """Record one game of a user the way ingestion does: into the ledger, then recompute their totals."""
+    record_results(next(_message_ids), [WordleUser(name=name, score_sum=score, win_count=int(win), play_count=1)])
+    rebuild_totals([name])
+
+
+def test_record_game_new_entry(mock_db):
     """Test inserting a new Wordle entry."""
-    update_wordle_entry("TestUser", 150, True)
+    record_game("TestUser", 150, True)
 
     user = mock_db['wordle'].find_one({'_id': 'TestUser'})
     assert user is not None
@@ -36,9 +59,9 @@ def test_insert_wordle_entry(mock_db):
     assert user['win_count'] == 1
 
 
-def test_update_wordle_entry_new_user(mock_db):
+def test_record_game_new_user(mock_db):
     """Test creating a new Wordle entry for a user."""
-    update_wordle_entry("Alice", 100, True)
+    record_game("Alice", 100, True)
 
     user = mock_db['wordle'].find_one({'_id': 'Alice'})
     assert user is not None
@@ -47,9 +70,9 @@ def test_update_wordle_entry_new_user(mock_db):
     assert user['win_count'] == 1
 
 
-def test_update_wordle_entry_loss(mock_db):
+def test_record_game_loss(mock_db):
     """Test updating a Wordle entry when user loses."""
-    update_wordle_entry("Bob", 50, False)
+    record_game("Bob", 50, False)
 
     user = mock_db['wordle'].find_one({'_id': 'Bob'})
     assert user is not None
@@ -58,11 +81,11 @@ def test_update_wordle_entry_loss(mock_db):
     assert user['win_count'] == 0
 
 
-def test_update_wordle_entry_multiple_games(mock_db):
+def test_record_game_multiple_games(mock_db):
     """Test updating a Wordle entry with multiple games."""
-    update_wordle_entry("Charlie", 100, True)
-    update_wordle_entry("Charlie", 80, True)
-    update_wordle_entry("Charlie", 90, False)
+    record_game("Charlie", 100, True)
+    record_game("Charlie", 80, True)
+    record_game("Charlie", 90, False)
 
     user = mock_db['wordle'].find_one({'_id': 'Charlie'})
     assert user['play_count'] == 3
@@ -72,7 +95,7 @@ def test_update_wordle_entry_multiple_games(mock_db):
 
 def test_get_avg_scores_single_user(mock_db):
     """Test getting average scores with a single user."""
-    update_wordle_entry("User1", 100, True)
+    record_game("User1", 100, True)
 
     results = get_top_avg_scores(10)
 
@@ -84,16 +107,16 @@ def test_get_avg_scores_single_user(mock_db):
 def test_get_avg_scores_multiple_users(mock_db):
     """Test getting average scores with multiple users."""
     # User1: 100/1 = 100.0
-    update_wordle_entry("User1", 100, True)
+    record_game("User1", 100, True)
 
     # User2: 150/2 = 75.0
-    update_wordle_entry("User2", 80, True)
-    update_wordle_entry("User2", 70, False)
+    record_game("User2", 80, True)
+    record_game("User2", 70, False)
 
     # User3: 210/3 = 70.0
-    update_wordle_entry("User3", 70, True)
-    update_wordle_entry("User3", 70, True)
-    update_wordle_entry("User3", 70, False)
+    record_game("User3", 70, True)
+    record_game("User3", 70, True)
+    record_game("User3", 70, False)
 
     results = get_top_avg_scores(10)
 
@@ -109,10 +132,10 @@ def test_get_avg_scores_multiple_users(mock_db):
 
 def test_get_avg_scores_with_limit(mock_db):
     """Test getting average scores with a limit."""
-    update_wordle_entry("User1", 100, True)
-    update_wordle_entry("User2", 80, True)
-    update_wordle_entry("User3", 60, True)
-    update_wordle_entry("User4", 120, True)
+    record_game("User1", 100, True)
+    record_game("User2", 80, True)
+    record_game("User3", 60, True)
+    record_game("User4", 120, True)
 
     results = get_top_avg_scores(2)
 
@@ -124,7 +147,7 @@ def test_get_avg_scores_with_limit(mock_db):
 
 def test_get_winners_single_user(mock_db):
     """Test getting winners with a single user."""
-    update_wordle_entry("WinnerUser", 100, True)
+    record_game("WinnerUser", 100, True)
 
     results = get_top_winners(10)
 
@@ -135,14 +158,14 @@ def test_get_winners_single_user(mock_db):
 
 def test_get_winners_multiple_users(mock_db):
     """Test getting winners with multiple users."""
-    update_wordle_entry("Alice", 100, True)
-    update_wordle_entry("Alice", 100, True)
+    record_game("Alice", 100, True)
+    record_game("Alice", 100, True)
 
-    update_wordle_entry("Bob", 100, True)
+    record_game("Bob", 100, True)
 
-    update_wordle_entry("Charlie", 100, True)
-    update_wordle_entry("Charlie", 100, True)
-    update_wordle_entry("Charlie", 100, True)
+    record_game("Charlie", 100, True)
+    record_game("Charlie", 100, True)
+    record_game("Charlie", 100, True)
 
     results = get_top_winners(10)
 
@@ -158,14 +181,14 @@ def test_get_winners_multiple_users(mock_db):
 
 def test_get_winners_with_limit(mock_db):
     """Test getting winners with a limit."""
-    update_wordle_entry("Alice", 100, True)
-    update_wordle_entry("Alice", 100, True)
+    record_game("Alice", 100, True)
+    record_game("Alice", 100, True)
 
-    update_wordle_entry("Bob", 100, True)
+    record_game("Bob", 100, True)
 
-    update_wordle_entry("Charlie", 100, True)
-    update_wordle_entry("Charlie", 100, True)
-    update_wordle_entry("Charlie", 100, True)
+    record_game("Charlie", 100, True)
+    record_game("Charlie", 100, True)
+    record_game("Charlie", 100, True)
 
     results = get_top_winners(2)
 
@@ -179,10 +202,10 @@ def test_get_winners_with_limit(mock_db):
 
 def test_get_winners_users_with_no_wins(mock_db):
     """Test that users with no wins are not returned."""
-    update_wordle_entry("User1", 100, False)
-    update_wordle_entry("User1", 100, False)
+    record_game("User1", 100, False)
+    record_game("User1", 100, False)
 
-    update_wordle_entry("User2", 100, True)
+    record_game("User2", 100, True)
 
     results = get_top_winners(10)
 
@@ -192,3 +215,111 @@ def test_get_winners_users_with_no_wins(mock_db):
     assert results[0][1] == 1
     assert results[1][0] == "User1"
     assert results[1][1] == 0
+
+
+def test_record_results_once(mock_db):
+    """Test that a message is recorded in the ledger at most once."""
+    results = [WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)]
+
+    assert record_results(1, results) is True
+    assert record_results(1, results) is False
+    assert mock_db['wordle_ledger'].count_documents({}) == 1
+
+
+def test_bulk_record_results_skips_recorded(mock_db):
+    """Test bulk recording ignores messages already in the ledger."""
+    record_results(1, [WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)])
+
+    recorded = bulk_record_results({
+        1: [WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)],
+        2: [WordleUser(name="Bob", win_count=0, play_count=1, score_sum=7)],
+    })
+
+    assert recorded == 1
+    assert mock_db['wordle_ledger'].count_documents({}) == 2
+
+
+def test_bulk_record_results_raises_other_write_errors(mock_db, monkeypatch):
+    """Test a write error other than a duplicate key isn't mistaken for already recorded."""
+    error = BulkWriteError({'nInserted': 1, 'writeErrors': [
+        {'index': 0, 'code': 11000, 'errmsg': 'duplicate key'},
+        {'index': 1, 'code': 121, 'errmsg': 'document failed validation'}]})
+    monkeypatch.setattr(mock_db['wordle_ledger'], 'insert_many', MagicMock(side_effect=error))
+
+    with pytest.raises(BulkWriteError):
+        bulk_record_results({
+            1: [WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3)],
+            2: [WordleUser(name="Bob", win_count=0, play_count=1, score_sum=7)],
+        })
+
+
+def test_completed_through(mock_db):
+    """Test the crawl mark is kept in one document and can move back to retry a message."""
+    assert get_completed_through() is None
+
+    set_completed_through(5)
+    set_completed_through(3)
+
+    assert get_completed_through() == 3
+    assert mock_db['wordle_sync'].count_documents({}) == 1
+
+
+def test_rebuild_totals(mock_db):
+    """Test totals are derived from the ledger."""
+    bulk_record_results({
+        1: [WordleUser(name="Alice", win_count=1, play_count=1, score_sum=3),
+            WordleUser(name="Bob", win_count=0, play_count=1, score_sum=7)],
+        2: [WordleUser(name="Alice", win_count=0, play_count=1, score_sum=5)],
+    })
+    mock_db['wordle'].insert_one({'_id': 'Stale', 'play_count': 1, 'score_sum': 1, 'win_count': 1})
+
+    rebuild_totals(["Alice"])
+    alice = mock_db['wordle'].find_one({'_id': 'Alice'})
+    assert (alice['play_count'], alice['score_sum'], alice['win_count']) == (2, 8, 1)
+    assert mock_db['wordle'].find_one({'_id': 'Bob'}) is None
+
+    rebuild_totals()
+    bob = mock_db['wordle'].find_one({'_id': 'Bob'})
+    assert (bob['play_count'], bob['score_sum'], bob['win_count']) == (1, 7, 0)
+    assert mock_db['wordle'].find_one({'_id': 'Stale'}) is None
+
+
+def test_rebuild_all_with_empty_ledger_deletes_nothing(mock_db):
+    """Test an empty ledger never wipes the totals."""
+    mock_db['wordle'].insert_one({'_id': 'Alice', 'play_count': 300, 'score_sum': 1200, 'win_count': 20})
+
+    assert rebuild_totals() == 0
+    assert mock_db['wordle'].count_documents({}) == 1
+
+
+def test_writes_keep_leaderboard_fields(mock_db):
+    """Test that both partial and full rebuilds keep the precomputed averages current."""
+    record_game("Alice", 3, True)
+    record_game("Alice", 6, False)
+    record_results(1, [WordleUser(name="Bob", score_sum=4, win_count=1, play_count=1)])
+    rebuild_totals()
+
+    alice = mock_db['wordle'].find_one({'_id': 'Alice'})
+    bob = mock_db['wordle'].find_one({'_id': 'Bob'})
+    assert (alice['average_score'], alice['win_rate']) == (4.5, 0.5)
+    assert (bob['average_score'], bob['win_rate']) == (4.0, 1.0)
+
+
+def test_get_avg_scores_min_play_count(mock_db):
+    """Test that users with too few games are not ranked by average."""
+    record_game("Lucky", 1, True)
+    for score in (3, 4, 5):
+        record_game("Regular", score, False)
+
+    assert get_top_avg_scores(10, min_play_count=3) == [("Regular", 4.0)]
+    assert [name for name, _ in get_top_avg_scores(10)] == ["Lucky", "Regular"]
+
+
+def test_backfill_leaderboard_fields(mock_db):
+    """Test that totals written before the leaderboard fields existed get them."""
+    mock_db['wordle'].insert_one({'_id': 'Old', 'play_count': 4, 'score_sum': 14, 'win_count': 1})
+
+    backfill_leaderboard_fields()
+
+    old = mock_db['wordle'].find_one({'_id': 'Old'})
+    assert (old['average_score'], old['win_rate']) == (3.5, 0.25)
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from service.wordle_parser import FAILED_ATTEMPTS, parse_results, tokenize_results
+
+
+def test_tokenize_groups_mentions_by_score_block():
+    content = """Your group is on a 3 day streak! Here are yesterday's results:
+    👑 3/6: @Alice <@123>
+    5/6: @Bob
+    X/6: @Charlie
+    """
+
+    assert tokenize_results(content) == [
+        (3, ["Alice", "123"]),
+        (5, ["Bob"]),
+        (FAILED_ATTEMPTS, ["Charlie"]),
+    ]
+
+
+def test_tokenize_continues_block_on_following_lines():
+    content = """Here are yesterday's results:
+        1/6: @UserA @UserB
+        @UserD @UserE
+        2/6: @UserF
+        """
+
+    assert tokenize_results(content) == [
+        (1, ["UserA", "UserB", "UserD", "UserE"]),
+        (2, ["UserF"]),
+    ]
+
+
+def test_tokenize_keeps_spaces_in_names_but_not_newlines():
+    content = "4/6: @Display Name\n@Other Person"
+
+    assert tokenize_results(content) == [(4, ["Display Name", "Other Person"])]
+
+
+def test_tokenize_ignores_mentions_before_first_score():
+    assert tokenize_results("@Someone Here are yesterday's results:\n2/6: @A") == [(2, ["A"])]
+
+
+def test_tokenize_keeps_empty_blocks():
+    assert tokenize_results("2/6:\n3/6: @A") == [(2, []), (3, ["A"])]
+
+
+@pytest.mark.parametrize("content", ["", "Here are yesterday's results:", "no results @nobody"])
+def test_tokenize_without_scores(content):
+    assert tokenize_results(content) == []
+
+
+def test_parse_results_flattens_blocks():
+    assert parse_results("1/6: @A @B\nX/6: @C") == [(1, "A"), (1, "B"), (FAILED_ATTEMPTS, "C")]
+
+
+def test_tokenize_random_text_never_raises():
+    alphabet = "@/:<>X0123456 \n\tab_é👑"
+    rng = random.Random(0)
+    for _ in range(500):
+        content = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        for attempts, mentions in tokenize_results(content):
+            assert attempts >= 0
+            assert all(mention and mention == mention.strip() for mention in mentions)
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from service.wordle_parser import parse_results, tokenize_results
+
+pytest.importorskip("pytest_benchmark")
+
+HEADER = "Your group is on a {streak} day streak! 🔥 Here are yesterday's results:"
+
+
+def make_result_message(rng: random.Random, players: int) -> str:
+    """A synthetic result message with players spread over the score blocks."""
+    lines = [HEADER.format(streak=rng.randint(1, 500))]
+    scores = sorted(rng.sample(["1", "2", "3", "4", "5", "6", "X"], k=rng.randint(1, 7)),
+                    key=lambda score: score.replace("X", "7"))
+    mentions = [f"<@{rng.randint(10 ** 17, 10 ** 18)}>" if rng.random() < 0.8 else f"@Player {i}"
+                for i in range(players)]
+    for i, score in enumerate(scores):
+        block = mentions[i::len(scores)]
+        prefix = "👑 " if i == 0 else ""
+        # long blocks wrap onto continuation lines
+        lines.append(f"{prefix}{score}/6: " + " ".join(block[:5]))
+        for start in range(5, len(block), 5):
+            lines.append(" ".join(block[start:start + 5]))
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def corpus() -> list[str]:
+    rng = random.Random(2024)
+    return [make_result_message(rng, rng.randint(1, 40)) for _ in range(1000)]
+
+
+def test_corpus_is_parsed_completely(corpus):
+    for content in corpus:
+        mentions = [m for _, block in tokenize_results(content) for m in block]
+        assert len(mentions) == content.count("@")
+
+
+def test_benchmark_tokenize_results(benchmark, corpus):
+    benchmark(lambda: [tokenize_results(content) for content in corpus])
+
+
+def test_benchmark_parse_results(benchmark, corpus):
+    benchmark(lambda: [parse_results(content) for content in corpus])
+
+
+def test_benchmark_large_message(benchmark):
+    content = make_result_message(random.Random(7), 500)
+
+    groups = benchmark(tokenize_results, content)
+
+    assert sum(len(mentions) for _, mentions in groups) == 500
@@ -1,9 +1,11 @@
+import asyncio
+
+import hikari
 import pytest
 import mongomock
 from unittest.mock import MagicMock, patch, AsyncMock
 from hikari import Message, User, Snowflake
 
-from persistence.mongo.wordle_mongo_client import wordle_collection
 # We need to mock the imports inside wordle_service before importing it
 # if dependencies aren't actually installed in this environment.
 # However, assuming the environment is set up, we import the functions under test.
@@ -11,13 +13,25 @@ from persistence.mongo.wordle_mongo_client import wordle_collection
 from service.wordle_service import (
     is_wordle_message,
     parse_wordle_message,
+    parse_wordle_messages,
     initialize_wordle_messages
 )
 from domain.Wordle import WordleUser
+from service.user_id_cache import UsernameCache
 
 # --- Fixtures ---
 
 
+def stream_of(messages, error=None):
+    """Side effect making a mocked stream_user_messages yield the given messages, then raise error."""
+    async def _stream(*args, **kwargs):
+        for message in messages:
+            yield message
+        if error:
+            raise error
+    return _stream
+
+
 @pytest.fixture
 def mock_rest():
     """Mock RESTClient for tests."""
@@ -51,7 +65,11 @@ def mock_db(monkeypatch):
     monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
     monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
     monkeypatch.setattr(
-        'persistence.mongo.wordle_mongo_client.wordle_collection', wordle_collection)
+        'persistence.mongo.wordle_mongo_client.wordle_collection', db['wordle'])
+    monkeypatch.setattr(
+        'persistence.mongo.wordle_mongo_client.ledger_collection', db['wordle_ledger'])
+    monkeypatch.setattr(
+        'persistence.mongo.wordle_mongo_client.sync_collection', db['wordle_sync'])
     return db
 
 # --- Tests for is_wordle_message ---
@@ -230,7 +248,7 @@ async def test_parse_multiline_users(mock_rest, mock_message):
 
 
 @pytest.mark.asyncio
-@patch('service.wordle_service.search_user_messages')
+@patch('service.wordle_service.stream_user_messages')
 @patch('service.wordle_service.channel_id', "general-channel")
 @patch('service.wordle_service.wordle_user_id', "bot-id")
 async def test_initialize_wordle_messages(mock_search, mock_message, mock_db):
@@ -248,36 +266,32 @@ async def test_initialize_wordle_messages(mock_search, mock_message, mock_db):
     msg2_content = "Here are yesterday's results:\n4/6: @UserA\nX/6: @UserB"
 
     msg1 = mock_message(12345, msg1_content)
+    msg1.id = Snowflake(1)
     msg2 = mock_message(12345, msg2_content)
+    msg2.id = Snowflake(2)
 
-    mock_search.return_value = [msg1, msg2]
+    mock_search.side_effect = stream_of([msg1, msg2])
 
-    # Define a side effect for the client.insert that writes to our mock_db
-    # This simulates the persistence layer writing to the DB
-    def fake_insert(user: WordleUser):
-        # Store the user object as a dict in the mock collection
-        # We assume WordleUser has a standard object structure
-        mock_db.wordle_users.insert_one(vars(user))
-
-    # Patch the client in the service to use our fake_insert
-    with patch('service.wordle_service.wordle_mongo_client') as mock_client:
-        mock_client.insert.side_effect = fake_insert
-
-        # Execute
-        await initialize_wordle_messages(mock_bot)
+    # Execute against the real persistence layer backed by mongomock
+    progress = await initialize_wordle_messages(mock_bot)
 
     # Verify Search was called correctly
     mock_search.assert_called_once_with(
-        mock_bot, "general-channel", is_wordle_message)
+        mock_bot, "general-channel", is_wordle_message, after=None)
+
+    # Each message is recorded once in the ledger
+    assert mock_db.wordle_ledger.count_documents({}) == 2
+    assert (progress.scanned, progress.parsed, progress.recorded, progress.users_updated) == (2, 2, 2, 2)
+    assert progress.error is None
 
     # Verify Data in Mongomock (The Real In-Memory DB)
-    collection = mock_db.wordle_users
+    collection = mock_db.wordle
 
     # We expect 2 documents: UserA and UserB
     assert collection.count_documents({}) == 2
 
     # Fetch UserA from DB
-    user_a_doc = collection.find_one({"name": "UserA"})
+    user_a_doc = collection.find_one({"_id": "UserA"})
     assert user_a_doc is not None
     # Game 1: 3/6 (Win, 4 pts)
     # Game 2: 4/6 (Win (min attempts), 3 pts) -> Total 7 pts
@@ -285,14 +299,208 @@ async def test_initialize_wordle_messages(mock_search, mock_message, mock_db):
     assert user_a_doc['score_sum'] == 7
 
     # Fetch UserB from DB
-    user_b_doc = collection.find_one({"name": "UserB"})
+    user_b_doc = collection.find_one({"_id": "UserB"})
     assert user_b_doc is not None
     assert user_b_doc['play_count'] == 1
     assert user_b_doc['score_sum'] == 7
 
 
 @pytest.mark.asyncio
-@patch('service.wordle_service.search_user_messages')
+@patch('service.wordle_service.stream_user_messages')
+@patch('service.wordle_service.channel_id', "general-channel")
+@patch('service.wordle_service.wordle_user_id', "bot-id")
+async def test_initialize_resumes_after_completed_crawl(mock_search, mock_message, mock_db):
+    """Test that only messages after the last finished crawl are ingested, exactly once."""
+    mock_db.wordle_ledger.insert_one(
+        {"_id": 10, "results": [{"name": "UserA", "score": 2, "win": True}]})
+    mock_db.wordle_sync.insert_one({"_id": "history", "completed_through": 10})
+    msg = mock_message(12345, "Here are yesterday's results:\n3/6: @UserA")
+    msg.id = Snowflake(11)
+    mock_search.side_effect = stream_of([msg])
+    mock_bot = MagicMock()
+
+    await initialize_wordle_messages(mock_bot)
+    # A second run that sees the same message again must not double count it
+    progress = await initialize_wordle_messages(mock_bot)
+
+    assert (progress.scanned, progress.recorded, progress.users_updated) == (1, 0, 1)
+
+    assert mock_search.call_args_list[0].kwargs == {"after": 10}
+    assert mock_search.call_args_list[1].kwargs == {"after": 11}
+    user_a_doc = mock_db.wordle.find_one({"_id": "UserA"})
+    assert user_a_doc['play_count'] == 2
+    assert user_a_doc['score_sum'] == 5
+    assert user_a_doc['win_count'] == 2
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.stream_user_messages')
+@patch('service.wordle_service.channel_id', "general-channel")
+@patch('service.wordle_service.wordle_user_id', "bot-id")
+async def test_initialize_full_rebuild_ignores_last_message(mock_search, mock_db):
+    """Test that a full rebuild searches the whole history and recomputes every total."""
+    mock_db.wordle_ledger.insert_one(
+        {"_id": 10, "results": [{"name": "UserA", "score": 2, "win": True}]})
+    mock_db.wordle.insert_one({"_id": "Stale", "play_count": 1, "score_sum": 1, "win_count": 1})
+    mock_search.side_effect = stream_of([])
+    mock_bot = MagicMock()
+
+    await initialize_wordle_messages(mock_bot, full_rebuild=True)
+
+    mock_search.assert_called_once_with(
+        mock_bot, "general-channel", is_wordle_message, after=None)
+    assert [doc['_id'] for doc in mock_db.wordle.find()] == ["UserA"]
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.stream_user_messages')
+@patch('service.wordle_service.channel_id', "general-channel")
+@patch('service.wordle_service.wordle_user_id', "bot-id")
+@patch('service.wordle_service.INGEST_BATCH_SIZE', 2)
+async def test_interrupted_crawl_is_redone_from_the_same_point(mock_search, mock_message, mock_db):
+    """Test that a crawl failing halfway through the history doesn't strand the older messages."""
+    history = []
+    for message_id in range(10, 0, -1):
+        message = mock_message(12345, "Here are yesterday's results:\n3/6: @UserA")
+        message.id = Snowflake(message_id)
+        history.append(message)
+    # Newest first, failing after 5 messages, then complete
+    mock_search.side_effect = [stream_of(history[:5], error=RuntimeError("rate limited"))(),
+                               stream_of(history)()]
+    mock_bot = MagicMock()
+
+    failed = await initialize_wordle_messages(mock_bot)
+    assert failed.error == "rate limited"
+    assert mock_db.wordle_sync.count_documents({}) == 0
+
+    progress = await initialize_wordle_messages(mock_bot)
+
+    assert progress.error is None
+    assert mock_search.call_args_list[1].kwargs == {"after": None}
+    assert mock_db.wordle_ledger.count_documents({}) == 10
+    assert mock_db.wordle.find_one({"_id": "UserA"})['play_count'] == 10
+    assert mock_db.wordle_sync.find_one({"_id": "history"})['completed_through'] == 10
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.channel_id', 1)
+@patch('service.wordle_service.wordle_user_id', 2)
+async def test_failed_full_rebuild_keeps_totals(mock_db):
+    """Test that a full rebuild whose crawl fails reports it and deletes nothing."""
+    mock_db.wordle.insert_one({"_id": "Alice", "play_count": 300, "score_sum": 1200, "win_count": 20})
+    mock_bot = MagicMock()
+    mock_bot.rest.fetch_channel = AsyncMock(side_effect=RuntimeError("Discord is down"))
+
+    progress = await initialize_wordle_messages(mock_bot, full_rebuild=True)
+
+    assert progress.error == "Discord is down"
+    assert mock_db.wordle.find_one({"_id": "Alice"})['play_count'] == 300
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.stream_user_messages')
+@patch('service.wordle_service.channel_id', "general-channel")
+@patch('service.wordle_service.wordle_user_id', "bot-id")
+async def test_full_rebuild_with_empty_ledger_keeps_totals(mock_search, mock_db):
+    """Test that a full rebuild finding no messages doesn't wipe the totals."""
+    mock_db.wordle.insert_one({"_id": "Alice", "play_count": 300, "score_sum": 1200, "win_count": 20})
+    mock_search.side_effect = stream_of([])
+
+    progress = await initialize_wordle_messages(MagicMock(), full_rebuild=True)
+
+    assert progress.error is None
+    assert mock_db.wordle.count_documents({}) == 1
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.stream_user_messages')
+@patch('service.wordle_service.channel_id', "general-channel")
+@patch('service.wordle_service.wordle_user_id', "bot-id")
+async def test_message_with_unresolved_user_is_retried(mock_search, mock_message, mock_db, monkeypatch):
+    """Test that a message whose player can't be resolved isn't recorded and the next crawl reads it again."""
+    cache = UsernameCache(maxsize=100)
+    monkeypatch.setattr(cache, 'flush', AsyncMock())
+    monkeypatch.setattr('service.username_resolver.username_cache', cache)
+    history = []
+    for message_id, content in [(3, "3/6: @Alice"), (2, "4/6: @Alice @777"), (1, "5/6: @Alice")]:
+        message = mock_message(12345, "Here are yesterday's results:\n" + content)
+        message.id = Snowflake(message_id)
+        history.append(message)
+    mock_search.side_effect = [stream_of(history)(), stream_of(history[:2])()]
+    mock_bot = MagicMock()
+    mock_bot.rest.fetch_user = AsyncMock(side_effect=Exception("rate limited"))
+
+    progress = await initialize_wordle_messages(mock_bot)
+
+    assert (progress.recorded, progress.unresolved) == (2, 1)
+    assert mock_db.wordle_ledger.find_one({"_id": 2}) is None
+    assert mock_db.wordle_sync.find_one({"_id": "history"})['completed_through'] == 1
+
+    resolved = MagicMock()
+    resolved.display_name = "Bob"
+    mock_bot.rest.fetch_user = AsyncMock(return_value=resolved)
+    progress = await initialize_wordle_messages(mock_bot)
+
+    assert mock_search.call_args_list[1].kwargs == {"after": 1}
+    assert (progress.recorded, progress.unresolved) == (1, 0)
+    assert mock_db.wordle.find_one({"_id": "Bob"})['play_count'] == 1
+    assert mock_db.wordle.find_one({"_id": "Alice"})['play_count'] == 3
+    assert mock_db.wordle_sync.find_one({"_id": "history"})['completed_through'] == 3
+
+
+class EndlessHistory:
+    """A channel history that keeps producing messages, counting how many were fetched."""
+
+    def __init__(self):
+        self.fetched = 0
+
+    def limit(self, limit):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            await asyncio.sleep(0.001)
+            self.fetched += 1
+            message = MagicMock()
+            message.id = Snowflake(self.fetched)
+            yield message
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.channel_id', 1)
+@patch('service.wordle_service.wordle_user_id', 2)
+@patch('service.wordle_service.INGEST_BATCH_SIZE', 1)
+@patch('service.wordle_service.is_wordle_message', lambda message: True)
+async def test_cancelled_crawl_stops_fetching_history(mock_db):
+    """Test that cancelling a crawl while it records a batch closes the stream, so history stops being fetched."""
+    history = EndlessHistory()
+    channel = MagicMock(spec=hikari.channels.TextableChannel)
+    channel.fetch_history.return_value = history
+    mock_bot = MagicMock()
+    mock_bot.rest.fetch_channel = AsyncMock(return_value=channel)
+
+    async def slow_batch(*args):
+        await asyncio.sleep(10)
+
+    with patch('service.wordle_service._record_batch', slow_batch):
+        crawl = asyncio.create_task(initialize_wordle_messages(mock_bot))
+        await asyncio.sleep(0.02)
+        crawl.cancel()
+        # the traceback keeps the crawl's frame and so an unclosed stream alive
+        with pytest.raises(asyncio.CancelledError) as cancelled:
+            await crawl
+    fetched = history.fetched
+    await asyncio.sleep(0.05)
+
+    assert history.fetched == fetched
+    assert cancelled.value is not None
+
+
+@pytest.mark.asyncio
+@patch('service.wordle_service.stream_user_messages')
 async def test_initialize_aborts_missing_config(mock_search):
     """Test that initialization aborts gracefully if config is missing."""
     # Patch the module variables to be None
@@ -302,3 +510,28 @@ async def test_initialize_aborts_missing_config(mock_search):
 
         # Should not attempt to search
         mock_search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_parse_messages_resolves_ids_once_per_batch(mock_message, monkeypatch):
+    """Test that ids mentioned across a batch are fetched once, then applied per message."""
+    cache = UsernameCache(maxsize=100)
+    monkeypatch.setattr(cache, 'flush', AsyncMock())
+    monkeypatch.setattr('service.username_resolver.username_cache', cache)
+    rest = MagicMock()
+    discord_user = MagicMock()
+    discord_user.display_name = "Resolved"
+    rest.fetch_user = AsyncMock(return_value=discord_user)
+
+    msg1 = mock_message(12345, "Here are yesterday's results:\n3/6: @111 @Alice")
+    msg1.id = Snowflake(1)
+    msg2 = mock_message(12345, "Here are yesterday's results:\n2/6: @Alice\n4/6: @111")
+    msg2.id = Snowflake(2)
+
+    results = await parse_wordle_messages(rest, [msg1, msg2])
+
+    rest.fetch_user.assert_awaited_once_with(Snowflake(111))
+    assert [(user.name, user.score_sum, user.win_count) for user in results[Snowflake(1)]] == [
+        ("Resolved", 3, 1), ("Alice", 3, 1)]
+    assert [(user.name, user.score_sum, user.win_count) for user in results[Snowflake(2)]] == [
+        ("Alice", 2, 1), ("Resolved", 4, 0)]
@@ -0,0 +1,101 @@
+# test_yo_counter.py
+import asyncio
+from unittest.mock import MagicMock
+
+import mongomock
+import pytest
+
+from service.yo_counter import YoCounter
+
+
+class MockAuthor:
+    def __init__(self, user_id: str, display_name: str):
+        self.id = user_id
+        self.display_name = display_name
+
+
+ALICE = MockAuthor("1", "Alice")
+BOB = MockAuthor("2", "Bob")
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client['tubalub']
+
+    monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    monkeypatch.setattr(
+        'persistence.mongo.user_mongo_client.users_collection', db['users'])
+    db['users'].insert_one({"_id": "yo-counter", "count": 10, "threshold": 100})
+
+    yield db
+
+
+@pytest.mark.asyncio
+async def test_counts_locally_until_flushed(mock_db):
+    counter = YoCounter(flush_size=100, flush_interval_seconds=60)
+
+    first = await counter.increment(ALICE)
+    second = await counter.increment(BOB)
+    await counter.increment(ALICE)
+
+    assert (first['count'], second['count']) == (11, 12)
+    assert first['threshold'] == 100
+    assert mock_db['users'].find_one({"_id": "yo-counter"})['count'] == 10
+    assert counter.pending_count() == 3
+
+    await counter.flush()
+
+    assert mock_db['users'].find_one({"_id": "yo-counter"})['count'] == 13
+    assert mock_db['users'].find_one({"_id": "1"}) == {"_id": "1", "yo_count": 2, "display_name": "Alice"}
+    assert mock_db['users'].find_one({"_id": "2"})['yo_count'] == 1
+    assert counter.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_flushes_at_size_threshold(mock_db):
+    counter = YoCounter(flush_size=2, flush_interval_seconds=60)
+
+    await counter.increment(ALICE)
+    await counter.increment(BOB)
+    await counter._flush_task
+
+    assert mock_db['users'].find_one({"_id": "yo-counter"})['count'] == 12
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval(mock_db):
+    counter = YoCounter(flush_size=100, flush_interval_seconds=0.01)
+
+    await counter.increment(ALICE)
+    await asyncio.wait_for(counter._flush_task, 1)
+
+    assert mock_db['users'].find_one({"_id": "1"})['yo_count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_count_includes_pending(mock_db):
+    mock_db['users'].insert_one({"_id": "1", "yo_count": 5})
+    counter = YoCounter(flush_size=100, flush_interval_seconds=60)
+
+    await counter.increment(ALICE)
+
+    assert await counter.get_user_count(ALICE) == 6
+    assert await counter.get_user_count(BOB) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_yos(mock_db, monkeypatch):
+    counter = YoCounter(flush_size=100, flush_interval_seconds=60)
+    await counter.increment(ALICE)
+
+    with monkeypatch.context() as m:
+        m.setattr('persistence.mongo.user_mongo_client.bulk_add_yo_counts',
+                  MagicMock(side_effect=Exception("Mongo is down")))
+        await counter.flush()
+    await counter.increment(ALICE)
+
+    assert counter.pending_count() == 2
+    await counter.flush()
+    assert mock_db['users'].find_one({"_id": "1"})['yo_count'] == 2
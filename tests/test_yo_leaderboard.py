@@ -0,0 +1,74 @@
+# test_yo_leaderboard.py
+from unittest.mock import patch
+
+import mongomock
+import pytest
+
+from service.yo_leaderboard import YoLeaderboard
+
+
+@pytest.fixture
+def mock_db(monkeypatch):
+    client = mongomock.MongoClient()
+    db = client['tubalub']
+
+    monkeypatch.setattr('persistence.mongo.mongo_client.client', client)
+    monkeypatch.setattr('persistence.mongo.mongo_client.db', db)
+    monkeypatch.setattr(
+        'persistence.mongo.user_mongo_client.users_collection', db['users'])
+    db['users'].insert_many([
+        {"_id": "yo-counter", "count": 16},
+        {"_id": "1", "display_name": "Alice", "yo_count": 10},
+        {"_id": "2", "display_name": "Bob", "yo_count": 5},
+        {"_id": "3", "display_name": "Charlie", "yo_count": 1},
+        {"_id": "4", "display_name": "Quiet", "yo_count": 0},
+    ])
+
+    yield db
+
+
+@pytest.fixture
+def leaderboard(mock_db):
+    leaderboard = YoLeaderboard(chart_cache_size=4)
+    leaderboard.load()
+    return leaderboard
+
+
+def _ranking(users: list[dict]) -> list[tuple[str, int]]:
+    return [(user['display_name'], user['yo_count']) for user in users]
+
+
+def test_load_matches_database_ranking(leaderboard):
+    assert _ranking(leaderboard.top(5)) == [("Alice", 10), ("Bob", 5), ("Charlie", 1)]
+    assert _ranking(leaderboard.top(2)) == [("Alice", 10), ("Bob", 5)]
+
+
+def test_add_reorders_and_adds_users(leaderboard):
+    leaderboard.add("3", "Charlie", 10)
+    leaderboard.add("5", "Newcomer")
+
+    assert _ranking(leaderboard.top(5)) == [
+        ("Charlie", 11), ("Alice", 10), ("Bob", 5), ("Newcomer", 1)]
+
+
+def test_add_is_ignored_until_loaded(mock_db):
+    leaderboard = YoLeaderboard(chart_cache_size=4)
+
+    leaderboard.add("1", "Alice")
+    leaderboard.load()
+
+    assert _ranking(leaderboard.top(1)) == [("Alice", 10)]
+
+
+def test_chart_is_cached_until_next_yo(leaderboard, mock_db):
+    with patch('service.yo_leaderboard.format_table', side_effect=lambda users: str(_ranking(users))) as render:
+        first = leaderboard.chart(2)
+        assert leaderboard.chart(2) == first
+        # served from memory, even if Mongo disappeared
+        mock_db['users'].drop()
+        assert render.call_count == 1
+
+        leaderboard.add("2", "Bob", 6)
+
+        assert leaderboard.chart(2) == str([("Bob", 11), ("Alice", 10)])
+        assert render.call_count == 2
@@ -0,0 +1,58 @@
+"""
+Report what importing a module costs, from a fresh interpreter's -X importtime output.
+
+    python -m utils.import_profile [module] [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_import(module: str = "main") -> dict[str, tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter and collect the import times it reports.
+
+    Args:
+        module: The module to import
+
+    Returns:
+        Module name -> (self microseconds, cumulative microseconds), for every module imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """Parse -X importtime lines, e.g. "import time:       120 |        340 |   yaml"."""
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", nargs="?", default="main")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    args = parser.parse_args()
+
+    timings = profile_import(args.module)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, (self_us, cumulative_us) in sorted(
+            timings.items(), key=lambda item: item[1][1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    print(f"{len(timings)} modules, importing {args.module} took "
+          f"{timings.get(args.module, (0, 0))[1] / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()